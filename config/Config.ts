@@ -40,6 +40,16 @@ export const DZ_IAM_USER_ID_LIST                = []; //['TEST123']; //allcaps
 export const DZ_MEMBER_ACCOUNT_LIST             = [];
 export const DZ_MEMBER_STACK_SET_EXEC_ROLE_LIST = [''];
 
+// Subscription request digest window in seconds (max 300). 0 sends one notification per subscription request
+export const DZ_NOTIFICATION_DIGEST_WINDOW_SECONDS = 0;
+// Owner project names whose subscription requests are always notified individually
+export const DZ_NOTIFICATION_DIGEST_URGENT_PROJECT_LIST: string[] = [];
+
+// S3 URI of a JSON Lines or CSV glossary file streamed into the Admin project glossaries. Keep blank to use only glossary_config.json
+export const DZ_GLOSSARY_IMPORT_URI = '';
+// Converge the Admin project glossaries from their live Amazon DataZone state instead of the stored glossary id mapping
+export const DZ_GLOSSARY_RECONCILE = false;
+
 // Keep blank if you don't have member accounts
 export const DZ_MEMBER_ACCOUNT_CONFIG: memberAccountConfig = {
 };
@@ -23,7 +23,11 @@ import * as iam from 'aws-cdk-lib/aws-iam';
 import * as datazone from 'aws-cdk-lib/aws-datazone';
 import { Provider } from 'aws-cdk-lib/custom-resources';
 import { CustomResource } from 'aws-cdk-lib';
-import { DZ_ADMIN_ROLE_ARN } from '../config/Config';
+import {
+  DZ_ADMIN_ROLE_ARN,
+  DZ_GLOSSARY_IMPORT_URI,
+  DZ_GLOSSARY_RECONCILE,
+} from '../config/Config';
 import GlossaryConfig = require('./utils/glossary_config.json');
 import MetadataFormConfig = require('./utils/metadata_form_config.json');
 
@@ -249,6 +253,8 @@ export class DzDataMeshGovInfraStack extends cdk.Stack {
           ProjectGlossaries: glossaryConfig.projectGlossaries,
           GlossaryParameterStoreName: `/${props.applicationName.toLowerCase()}/${props.stageName.toLowerCase()}/${props.domainName.toLowerCase()}/${props.projectName.toLowerCase()}/glossary-name-id`,
           GlossaryTermParameterStoreNamePrefix: `/${props.applicationName.toLowerCase()}/${props.stageName.toLowerCase()}/${props.domainName.toLowerCase()}/${props.projectName.toLowerCase()}/glossary-term-name-id`,
+          GlossaryImportUri: DZ_GLOSSARY_IMPORT_URI,
+          GlossaryReconcile: String(DZ_GLOSSARY_RECONCILE),
         },
       },
     );
@@ -277,6 +283,7 @@ export class DzDataMeshGovInfraStack extends cdk.Stack {
           ProjectName: props.projectName,
           MetadataFormProjectName: metadataFormConfig.projectName,
           ProjectMetadataForms: metadataFormConfig.projectMetadataForms,
+          MetadataFormHashParameterName: `/${props.applicationName.toLowerCase()}/${props.stageName.toLowerCase()}/${props.domainName.toLowerCase()}/${props.projectName.toLowerCase()}/metadata-form-hash`,
         },
       },
     );
@@ -527,6 +527,7 @@ export class DzDataMeshHelperStack extends cdk.Stack {
         new iam.PolicyStatement({
           actions: [
             'cloudformation:ListStacks',
+            'cloudformation:DescribeStacks',
           ],
           resources: ['*'],
         }),
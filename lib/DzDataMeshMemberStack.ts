@@ -182,6 +182,7 @@ export class DzDataMeshMemberStack extends cdk.Stack {
             'cloudformation:SetStackPolicy',
             'cloudformation:ValidateTemplate',
             'cloudformation:ListStacks',
+            'cloudformation:DescribeStacks',
             'cloudformation:CreateChangeSet',
           ],
           resources: ['*'],
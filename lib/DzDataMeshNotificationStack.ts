@@ -23,6 +23,8 @@ import {
   DZ_ADMINISTRATOR_EMAIL,
   DZ_MEMBER_ACCOUNT_CONFIG,
   DZ_MEMBER_STACK_SET_EXEC_ROLE_LIST,
+  DZ_NOTIFICATION_DIGEST_URGENT_PROJECT_LIST,
+  DZ_NOTIFICATION_DIGEST_WINDOW_SECONDS,
 } from '../config/Config';
 import { Duration } from 'aws-cdk-lib';
 import * as lambda from 'aws-cdk-lib/aws-lambda';
@@ -158,7 +160,11 @@ export class DzDataMeshNotificationStack extends cdk.Stack {
           resources: [`arn:aws:ssm:${this.region}:${this.account}:parameter/*`],
         }),
         new iam.PolicyStatement({
-          actions: ['datazone:GetProject', 'datazone:GetAsset'],
+          actions: [
+            'datazone:GetProject',
+            'datazone:GetAsset',
+            'datazone:GetUserProfile',
+          ],
           resources: ['*'],
         }),
         new iam.PolicyStatement({
@@ -227,19 +233,78 @@ export class DzDataMeshNotificationStack extends cdk.Stack {
         PARAMETER_STORE_NAME_PREFIX: `${props.applicationName.toLowerCase()}/${props.stageName.toLowerCase()}/${props.domainName.toLowerCase()}`,
         DOMAIN_ID_PARAMETER_NAME: `/${props.applicationName.toLowerCase()}/${props.stageName.toLowerCase()}/${props.domainName.toLowerCase()}/domain-id`,
         CURRENT_REGION: this.region,
+        NOTIFICATION_DIGEST_URGENT_PROJECTS:
+          DZ_NOTIFICATION_DIGEST_URGENT_PROJECT_LIST.join(','),
       },
       handler: lambdaHandler,
       ...lambdaProperties,
     });
 
+    if (DZ_NOTIFICATION_DIGEST_WINDOW_SECONDS > 0) {
+      this.manageNotificationDigestQueue(props, lambdaFunction);
+    }
+
     const eventSource = new lambdaEventSources.SqsEventSource(
       this.dzDataMeshNotificationQueue,
+      {
+        batchSize: 10,
+        maxBatchingWindow: Duration.seconds(5),
+        reportBatchItemFailures: true,
+      },
     );
     lambdaFunction.addEventSource(eventSource);
 
     return lambdaFunction;
   }
 
+  private manageNotificationDigestQueue(
+    props: DzDataMeshNotificationStackProps,
+    lambdaFunction: lambda.Function,
+  ) {
+    const deadLetterQueue = new sqs.Queue(
+      this,
+      `${props.applicationName}-DzDataMeshNotificationDigestQueue-DLQ`,
+      {
+        visibilityTimeout: Duration.seconds(700),
+        retentionPeriod: Duration.days(7),
+        enforceSSL: true,
+        encryption: sqs.QueueEncryption.SQS_MANAGED,
+      },
+    );
+
+    const digestQueue = new sqs.Queue(
+      this,
+      'DzDataMeshNotificationDigestQueue',
+      {
+        visibilityTimeout: Duration.seconds(700),
+        retentionPeriod: Duration.days(7),
+        encryption: sqs.QueueEncryption.SQS_MANAGED,
+        enforceSSL: true,
+        deadLetterQueue: {
+          maxReceiveCount: 5,
+          queue: deadLetterQueue,
+        },
+      },
+    );
+
+    digestQueue.grantSendMessages(lambdaFunction);
+    lambdaFunction.addEnvironment(
+      'NOTIFICATION_DIGEST_QUEUE_URL',
+      digestQueue.queueUrl,
+    );
+    lambdaFunction.addEventSource(
+      new lambdaEventSources.SqsEventSource(digestQueue, {
+        batchSize: 100,
+        maxBatchingWindow: Duration.seconds(
+          DZ_NOTIFICATION_DIGEST_WINDOW_SECONDS,
+        ),
+        reportBatchItemFailures: true,
+      }),
+    );
+
+    return digestQueue;
+  }
+
   private createAdministratorEmailNotificationTopic(
     props: DzDataMeshNotificationStackProps,
   ) {
@@ -0,0 +1,239 @@
+"""
+Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+SPDX-License-Identifier: MIT-0
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this
+software and associated documentation files (the "Software"), to deal in the Software
+without restriction, including without limitation the rights to use, copy, modify,
+merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+
+This script measures the cold start cost of every Lambda entry point of the solution.
+
+Each handler module is imported in a fresh Python interpreter with stubbed environment
+variables, fake credentials and an unreachable AWS endpoint, so no AWS call can leave the
+machine. For each module the script reports:
+    libraries_ms: Wall time of the boto3, Powertools and shared layer imports.
+    import_ms: Wall time of the handler module import, once the libraries are imported.
+    logger_tracer_ms: Time spent building Powertools Logger and Tracer during the import.
+    client_count: Number of boto3 clients created during the import.
+    client_ms: Time spent creating boto3 clients during the import.
+    first_client_ms: Time to create the first client after the import (lazy clients).
+    peak_rss_kb: Peak resident set size of the interpreter.
+
+Usage:
+    python src/benchmarks/cold_start_benchmark.py --runs 5 --output cold_start_baseline.json
+    python src/benchmarks/cold_start_benchmark.py --runs 5 --baseline cold_start_baseline.json
+
+With --baseline the script exits with a non-zero code when a metric regressed by more than
+--tolerance percent.
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+from pathlib import Path
+from statistics import median
+
+SRC_DIR = Path(__file__).resolve().parent.parent
+LAMBDA_FUNCTIONS_DIR = SRC_DIR / "lambda-functions"
+LAMBDA_LAYERS_DIR = SRC_DIR / "lambda-layers"
+
+STUB_ENVIRONMENT = {
+  "AWS_REGION": "us-east-1",
+  "AWS_DEFAULT_REGION": "us-east-1",
+  "AWS_ACCESS_KEY_ID": "testing",
+  "AWS_SECRET_ACCESS_KEY": "testing",
+  "AWS_SESSION_TOKEN": "testing",
+  "AWS_ENDPOINT_URL": "http://127.0.0.1:1",
+  "AWS_EC2_METADATA_DISABLED": "true",
+  "LOG_LEVEL": "ERROR",
+  "PARAMETER_STORE_NAME_PREFIX": "benchmark/dev/domain",
+  "NOTIFICATION_QUEUE_URL": "https://sqs.us-east-1.amazonaws.com/111111111111/notification",
+  "SQS_QUEUE_URL": "https://sqs.us-east-1.amazonaws.com/111111111111/queue",
+  "DOMAIN_ID_PARAMETER_NAME": "/benchmark/dev/domain/domain-id",
+  "DOMAIN_NAME": "benchmark",
+  "DOMAIN_ID": "dzd_benchmark",
+  "GOV_ACCOUNT_ID": "111111111111",
+  "CFN_ASSETS_URL_PREFIX": "https://benchmark.s3.amazonaws.com",
+  "STACK_SET_ADMIN_ROLE_TEMPLATE_NAME": "DzDataMeshCfnStackSetAdminRole.yaml",
+  "MEMBER_STACK_SET_NAME": "StackSet-DataZone-DataMesh-Member",
+  "GOV_STACK_NAME": "DataZone-DataMesh-StackSet-Admin",
+}
+
+# Metrics compared against the baseline, all of them lower is better
+COMPARED_METRICS = ("libraries_ms", "import_ms", "logger_tracer_ms", "client_ms", "first_client_ms", "peak_rss_kb")
+
+# Executed in the child interpreter: argv[1] is the module directory, argv[2] the module name
+CHILD_SCRIPT = """
+import sys
+import json
+import types
+import resource
+from time import perf_counter
+
+module_dir, module_name = sys.argv[1], sys.argv[2]
+sys.path.insert(0, module_dir)
+
+# cfnresponse is only provided by CloudFormation for inline functions
+cfnresponse = types.ModuleType("cfnresponse")
+cfnresponse.SUCCESS, cfnresponse.FAILED = "SUCCESS", "FAILED"
+cfnresponse.send = lambda *args, **kwargs: None
+sys.modules.setdefault("cfnresponse", cfnresponse)
+
+timings = {"logger_tracer_ms": 0.0, "client_ms": 0.0, "client_count": 0}
+
+
+def timed(function, metric, counter=None):
+  def wrapper(*args, **kwargs):
+    start = perf_counter()
+    try:
+      return function(*args, **kwargs)
+    finally:
+      timings[metric] += (perf_counter() - start) * 1000
+      if counter:
+        timings[counter] += 1
+  return wrapper
+
+
+start = perf_counter()
+import boto3.session
+from common import utils
+libraries_ms = (perf_counter() - start) * 1000
+
+create_client = boto3.session.Session.client
+boto3.session.Session.client = timed(create_client, "client_ms", "client_count")
+utils.get_logger = timed(utils.get_logger, "logger_tracer_ms")
+utils.get_tracer = timed(utils.get_tracer, "logger_tracer_ms")
+
+start = perf_counter()
+__import__(module_name)
+import_ms = (perf_counter() - start) * 1000
+
+boto3.session.Session.client = create_client
+start = perf_counter()
+utils.get_client("sts")
+first_client_ms = (perf_counter() - start) * 1000
+
+print(json.dumps({
+  "libraries_ms": libraries_ms,
+  "import_ms": import_ms,
+  "logger_tracer_ms": timings["logger_tracer_ms"],
+  "client_ms": timings["client_ms"],
+  "client_count": timings["client_count"],
+  "first_client_ms": first_client_ms,
+  "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+}))
+"""
+
+
+def discover_entry_points():
+  """
+  Return (module directory, module name) pairs for every Lambda entry point.
+  """
+  entry_points = []
+  for module_path in sorted(LAMBDA_FUNCTIONS_DIR.glob("*/*.py")):
+    entry_points.append((module_path.parent, module_path.stem))
+
+  return entry_points
+
+
+def run_once(module_dir, module_name):
+  """
+  Import a handler module in a fresh interpreter and return its measurements.
+  """
+  environment = {key: value for key, value in os.environ.items() if not key.startswith("AWS_")}
+  environment.update(STUB_ENVIRONMENT)
+  environment["PYTHONPATH"] = os.pathsep.join([str(LAMBDA_LAYERS_DIR), environment.get("PYTHONPATH", "")])
+
+  result = subprocess.run([sys.executable, "-c", CHILD_SCRIPT, str(module_dir), module_name],
+                          env=environment, capture_output=True, text=True, check=False)
+  if result.returncode != 0:
+    raise RuntimeError(f"Import of {module_name} failed: {result.stderr.strip()}")
+
+  return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def benchmark(runs):
+  """
+  Measure every entry point and return the median of each metric per module.
+  """
+  results = {}
+  for module_dir, module_name in discover_entry_points():
+    try:
+      samples = [run_once(module_dir, module_name) for _ in range(runs)]
+    except RuntimeError as err:
+      print(err, file=sys.stderr)
+      results[module_name] = {"error": str(err)}
+      continue
+
+    results[module_name] = {metric: round(median(sample[metric] for sample in samples), 2) for metric in samples[0]}
+
+  return results
+
+
+def compare(results, baseline, tolerance):
+  """
+  Return a list of regression messages for metrics worse than the baseline by more than tolerance percent.
+  """
+  regressions = []
+  for module_name, metrics in results.items():
+    baseline_metrics = baseline.get(module_name)
+    if not baseline_metrics or "error" in metrics or "error" in baseline_metrics:
+      continue
+    for metric in COMPARED_METRICS:
+      current, previous = metrics[metric], baseline_metrics.get(metric)
+      if previous and current > previous * (1 + tolerance / 100):
+        regressions.append(f"{module_name}.{metric}: {previous} -> {current} (+{(current / previous - 1) * 100:.1f}%)")
+
+  return regressions
+
+
+def print_report(results):
+  """
+  Print the measurements as a table.
+  """
+  columns = ("libraries_ms", "import_ms", "logger_tracer_ms", "client_count", "client_ms", "first_client_ms", "peak_rss_kb")
+  print(f"{'module':<52}" + "".join(f"{column:>18}" for column in columns))
+  for module_name, metrics in results.items():
+    if "error" in metrics:
+      print(f"{module_name:<52}{'error':>18}")
+      continue
+    print(f"{module_name:<52}" + "".join(f"{metrics[column]:>18}" for column in columns))
+
+
+def main():
+  parser = argparse.ArgumentParser(description="Cold start benchmark for the Lambda entry points")
+  parser.add_argument("--runs", type=int, default=5, help="Number of fresh interpreters per module")
+  parser.add_argument("--output", help="Write the results to this baseline file")
+  parser.add_argument("--baseline", help="Compare the results with this baseline file")
+  parser.add_argument("--tolerance", type=float, default=20.0, help="Allowed regression in percent")
+  args = parser.parse_args()
+
+  results = benchmark(args.runs)
+  print_report(results)
+
+  if args.output:
+    Path(args.output).write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+    print(f"Results written to {args.output}")
+
+  if args.baseline:
+    regressions = compare(results, json.loads(Path(args.baseline).read_text()), args.tolerance)
+    for regression in regressions:
+      print(f"Regression {regression}")
+    if regressions:
+      sys.exit(1)
+
+
+if __name__ == "__main__":
+  main()
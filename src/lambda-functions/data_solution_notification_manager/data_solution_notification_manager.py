@@ -19,11 +19,21 @@ This Lambda function is responsible for managing data solution notifications.
 
 Environment Variables:
     PARAMETER_STORE_NAME_PREFIX (str): The prefix for the parameter store names.
-    NOTIFICATION_QUEUE_URL (str): The URL of the notification queue.
     DOMAIN_ID_PARAMETER_NAME (str): The name of the parameter that stores the domain ID.
     AWS_REGION (str): The AWS region in which the function is running.
     LOG_LEVEL (str, optional): The log level for the function. Defaults to "INFO".
     TRACER_DISABLED (bool, optional): Whether to disable the tracer. Defaults to False.
+    SQS_BATCH_MAX_WORKERS (int, optional): The number of SQS records processed concurrently. Defaults to 5.
+    ENRICHMENT_TIMEOUT_SECONDS (float, optional): The time allowed for the subscription request lookups.
+        Defaults to 10.
+    ENRICHMENT_MAX_WORKERS (int, optional): The number of concurrent subscription request lookups. Defaults to 8.
+    ENTITY_CACHE_MAX_SIZE (int, optional): The maximum number of cached DataZone entities. Defaults to 2048.
+    ENTITY_CACHE_TTL_SECONDS (int, optional): The lifetime of a cached DataZone entity. Defaults to 900.
+    SNS_TOPIC_INDEX_TTL_SECONDS (int, optional): The refresh interval of the project SNS topic index. Defaults to 300.
+    NOTIFICATION_DIGEST_QUEUE_URL (str, optional): The URL of the queue buffering subscription requests for
+        digest notifications. Digest mode is disabled when not set.
+    NOTIFICATION_DIGEST_URGENT_PROJECTS (str, optional): Comma-separated owner project names whose
+        subscription requests are always notified individually.
 
 Functions:
     None
@@ -39,28 +49,41 @@ Classes:
 """
 
 import os
-from dataclasses import dataclass
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, asdict
+from time import monotonic, perf_counter
 from common import utils
 from botocore.exceptions import ClientError
 
 
 PARAMETER_STORE_NAME_PREFIX = os.environ["PARAMETER_STORE_NAME_PREFIX"]
-NOTIFICATION_QUEUE_URL = os.environ["NOTIFICATION_QUEUE_URL"]
 DOMAIN_ID_PARAMETER_NAME = os.environ["DOMAIN_ID_PARAMETER_NAME"]
 CURRENT_REGION = os.environ["AWS_REGION"]
-
-# Set logger, tracer, and session
+SQS_BATCH_MAX_WORKERS = int(os.environ.get("SQS_BATCH_MAX_WORKERS", 5))
+ENRICHMENT_TIMEOUT_SECONDS = float(os.environ.get("ENRICHMENT_TIMEOUT_SECONDS", 10))
+ENRICHMENT_MAX_WORKERS = int(os.environ.get("ENRICHMENT_MAX_WORKERS", 8))
+ENTITY_CACHE_MAX_SIZE = int(os.environ.get("ENTITY_CACHE_MAX_SIZE", 2048))
+ENTITY_CACHE_TTL_SECONDS = int(os.environ.get("ENTITY_CACHE_TTL_SECONDS", 900))
+SNS_TOPIC_INDEX_TTL_SECONDS = int(os.environ.get("SNS_TOPIC_INDEX_TTL_SECONDS", 300))
+NOTIFICATION_DIGEST_QUEUE_URL = os.environ.get("NOTIFICATION_DIGEST_QUEUE_URL", "")
+NOTIFICATION_DIGEST_URGENT_PROJECTS = set(filter(None, os.environ.get("NOTIFICATION_DIGEST_URGENT_PROJECTS", "").split(",")))
+# SNS subjects must be shorter than 100 characters
+SNS_SUBJECT_MAX_LENGTH = 99
+
+# Set logger and tracer
 log_level = os.environ.get("LOG_LEVEL", "INFO")
 tracer_disabled = os.environ.get("TRACER_DISABLED", False)
 logger = utils.get_logger(log_level=log_level, service_name="notification_manager")
 tracer = utils.get_tracer(tracer_disabled=tracer_disabled, service_name="notification_manager")
-session = utils.get_session()
 
-# Initiate clients
-ssm_client = session.client("ssm")
-sqs_client = session.client("sqs")
-sns_client = session.client("sns")
-dz_client = session.client("datazone")
+# DataZone entity names and user profiles keyed by (domain id, entity type, entity id), kept across warm invocations
+entity_cache = utils.LruCache(max_size=ENTITY_CACHE_MAX_SIZE, ttl=ENTITY_CACHE_TTL_SECONDS)
+
+# Expiry of the member project SNS topic index loaded into the parameter cache
+sns_topic_index_expires_at = 0
+sns_topic_index_lock = threading.Lock()
 
 
 @dataclass
@@ -84,9 +107,9 @@ class SubscriptionRequest:
   A class representing a request for subscribing to a data product in a data solution.
 
   Attributes:
-      dataProductName (str): The name of the data product being requested for subscription.
-      dataOwnerProjectName (str): The name of the project that owns the data product.
-      accessRequestorProjectName (str): The name of the project requesting access to the data product.
+      dataProductName (str): The names of the data products being requested for subscription.
+      dataOwnerProjectName (str): The name of the project that owns the data products.
+      accessRequestorProjectName (str): The names of the projects requesting access to the data products.
       userName (str): The name of the user making the subscription request.
   """
   dataProductName: str
@@ -101,12 +124,13 @@ def put_ssm_parameter_blueprint_id(member):
   """
   logger.info(f"Put SSM parameter /{PARAMETER_STORE_NAME_PREFIX}/member/{member.accountId}/{member.region}/blueprintId")
   try:
-    response = ssm_client.put_parameter(
+    response = utils.get_client("ssm").put_parameter(
       Name=f"/{PARAMETER_STORE_NAME_PREFIX}/member/{member.accountId}/{member.region}/blueprintId",
       Value=member.blueprintId,
       Type='String',
       Overwrite=True
     )
+    utils.invalidate_parameters(f"/{PARAMETER_STORE_NAME_PREFIX}/member/{member.accountId}/{member.region}/blueprintId")
     logger.info(
       f"SSM parameter {PARAMETER_STORE_NAME_PREFIX}/member/{member.accountId}/{member.region}/blueprintId created or updated!")
   except ClientError as err:
@@ -121,9 +145,7 @@ def get_application_domain_id():
   Get application domain ID
   """
   try:
-    domain_id = ssm_client.get_parameter(
-      Name=DOMAIN_ID_PARAMETER_NAME,
-    )["Parameter"]["Value"]
+    domain_id = utils.get_parameter(DOMAIN_ID_PARAMETER_NAME)
   except ClientError as err:
     logger.error(f"Exception {err}")
     raise err
@@ -131,70 +153,77 @@ def get_application_domain_id():
   return domain_id
 
 
+def refresh_sns_topic_index():
+  """
+  Load the SNS topic ARNs of all member projects into the parameter cache.
+
+  The whole /member/project prefix is read with paginated GetParametersByPath calls at most
+  once per SNS_TOPIC_INDEX_TTL_SECONDS.
+  """
+  global sns_topic_index_expires_at
+
+  with sns_topic_index_lock:
+    if monotonic() < sns_topic_index_expires_at:
+      return
+
+    try:
+      topics = utils.prefetch_parameters_by_path(f"/{PARAMETER_STORE_NAME_PREFIX}/member/project",
+                                                 ttl=SNS_TOPIC_INDEX_TTL_SECONDS)
+      logger.info(f"SNS topic index refreshed with {len(topics)} project topics")
+    except ClientError as err:
+      logger.error(f"Exception {err}")
+    sns_topic_index_expires_at = monotonic() + SNS_TOPIC_INDEX_TTL_SECONDS
+
+
 def get_ssm_parameter_sns_arn(project_name):
   """
   Get SSM parameter for SNS ARN
   """
-  logger.info(
-    f"Get SSM parameter /{PARAMETER_STORE_NAME_PREFIX}/member/project/{project_name}/{CURRENT_REGION}/sns-arn")
+  parameter_name = f"/{PARAMETER_STORE_NAME_PREFIX}/member/project/{project_name.lower()}/{CURRENT_REGION}/sns-arn"
+  logger.info(f"Get SSM parameter {parameter_name}")
+  refresh_sns_topic_index()
   try:
-    response = ssm_client.get_parameter(
-      Name=f"/{PARAMETER_STORE_NAME_PREFIX}/member/project/{project_name}{CURRENT_REGION}/sns-arn",
-    )
+    # Served from the topic index, a missing project falls back to a single lookup
+    sns_arn = utils.get_parameter(parameter_name, ttl=SNS_TOPIC_INDEX_TTL_SECONDS)
   except ClientError as err:
     logger.error(f"Exception {err}")
     raise err
 
-  return response["Parameter"]["Value"]
+  return sns_arn
 
 
 def get_admin_ssm_parameter_sns_arn():
   logger.info(
     f"Get SSM parameter /{PARAMETER_STORE_NAME_PREFIX}/sns-arn")
   try:
-    response = ssm_client.get_parameter(
-      Name=f"/{PARAMETER_STORE_NAME_PREFIX}/sns-arn",
-    )
+    sns_arn = utils.get_parameter(f"/{PARAMETER_STORE_NAME_PREFIX}/sns-arn")
   except ClientError as err:
     logger.error(f"Exception {err}")
     raise err
 
-  return response["Parameter"]["Value"]
+  return sns_arn
 
 
-def delete_message(message):
+def format_subscription_request(subscription_request):
   """
-  Delete message from SQS queue
+  Format the details of a subscription request for a notification message
   """
-  receipt_handle = message["receiptHandle"]
-  body = message["body"]
-
-  try:
-    sqs_client.delete_message(
-      QueueUrl=NOTIFICATION_QUEUE_URL,
-      ReceiptHandle=receipt_handle
-    )
-    logger.info(f"Deleting message with body: {body}")
-  except ClientError as err:
-    logger.error(f"Exception {err}")
-    raise err
-
-  return True
+  return f"Data product name: {subscription_request.dataProductName}\n" \
+         f"Data owner project name: {subscription_request.dataOwnerProjectName}\n" \
+         f"Data access requestor project name: {subscription_request.accessRequestorProjectName}\n" \
+         f"IAM role name: {subscription_request.userName}\n"
 
 
 def send_subscription_request_notification(subscription_request):
   try:
-    subject = f"Subscription request for {subscription_request.dataProductName}"
+    subject = f"Subscription request for {subscription_request.dataProductName}"[:SNS_SUBJECT_MAX_LENGTH]
     message = f"Subscription request for {subscription_request.dataProductName} has been received.\n\n" \
-              f"Data product name: {subscription_request.dataProductName}\n" \
-              f"Data owner project name: {subscription_request.dataOwnerProjectName}\n" \
-              f"Data access requestor project name: {subscription_request.accessRequestorProjectName}\n" \
-              f"IAM role name: {subscription_request.userName}\n"
+              f"{format_subscription_request(subscription_request)}"
 
     logger.info(f"Sending SNS notification")
     sns_arn = get_ssm_parameter_sns_arn(subscription_request.dataOwnerProjectName)
 
-    response = sns_client.publish(
+    response = utils.get_client("sns").publish(
       TopicArn=sns_arn,
       Subject=subject,
       Message=message
@@ -207,6 +236,64 @@ def send_subscription_request_notification(subscription_request):
     return None
 
 
+def is_digest_delivery(subscription_request):
+  """
+  Check if a subscription request is buffered for a digest instead of notified individually
+  """
+  return bool(NOTIFICATION_DIGEST_QUEUE_URL) and bool(subscription_request.dataOwnerProjectName) and \
+    subscription_request.dataOwnerProjectName not in NOTIFICATION_DIGEST_URGENT_PROJECTS
+
+
+def buffer_subscription_request(subscription_request):
+  """
+  Send a subscription request to the digest queue
+  """
+  try:
+    response = utils.get_client("sqs").send_message(
+      QueueUrl=NOTIFICATION_DIGEST_QUEUE_URL,
+      MessageBody=json.dumps(asdict(subscription_request)),
+      MessageAttributes={
+        "messageType": {
+          "DataType": "String",
+          "StringValue": "SubscriptionRequest"
+        },
+        "dataOwnerProjectName": {
+          "DataType": "String",
+          "StringValue": subscription_request.dataOwnerProjectName
+        },
+      }
+    )
+    logger.info(f"Subscription request buffered for project {subscription_request.dataOwnerProjectName}")
+  except ClientError as err:
+    logger.error(f"Exception {err}")
+    raise err
+
+  return response
+
+
+def send_subscription_request_digest(project_name, subscription_requests):
+  """
+  Publish a single digest notification for the subscription requests of a data owner project.
+
+  Errors are raised so that the buffered requests are redriven.
+  """
+  subject = f"{len(subscription_requests)} subscription requests for project {project_name}"[:SNS_SUBJECT_MAX_LENGTH]
+  message = f"{len(subscription_requests)} subscription requests for data products of project " \
+            f"{project_name} have been received.\n\n" + \
+            "\n".join(format_subscription_request(request) for request in subscription_requests)
+
+  logger.info(f"Sending SNS digest notification for project {project_name}")
+  sns_arn = get_ssm_parameter_sns_arn(project_name)
+  response = utils.get_client("sns").publish(
+    TopicArn=sns_arn,
+    Subject=subject,
+    Message=message
+  )
+  logger.info(f"Digest notification with {len(subscription_requests)} requests sent successfully")
+
+  return response
+
+
 def send_bootstrapping_status_notification(message):
   logger.info(f"Received message: {message}")
   try:
@@ -227,7 +314,7 @@ def send_bootstrapping_status_notification(message):
     logger.info(f"subject = {subject}")
     logger.info(f"message_body = {body}")
 
-    response = sns_client.publish(
+    response = utils.get_client("sns").publish(
       TopicArn=sns_arn,
       Subject=subject,
       Message=body
@@ -239,55 +326,42 @@ def send_bootstrapping_status_notification(message):
     return None
 
 
-def get_data_product_name(request_payload):
+def get_data_product_name(data_product_id):
   """
   Get data product name
   """
-  data_product_id = request_payload["subscribedListings"][0]["id"]
-  data_product_name = None
   domain_id = get_application_domain_id()
+  data_product_name = entity_cache.get((domain_id, "asset", data_product_id))
+  if data_product_name:
+    return data_product_name
+
   try:
-    data_product_name = dz_client.get_asset(
+    data_product_name = utils.get_client("datazone").get_asset(
       domainIdentifier=domain_id,
       identifier=data_product_id
     )['name']
+    entity_cache.put((domain_id, "asset", data_product_id), data_product_name)
   except ClientError as err:
     logger.error(f"Exception {err}")
 
   return data_product_name
 
 
-def get_access_requestor_project_name(request_payload):
-  """
-  Get access requestor project name
-  """
-  access_requestor_project_id = request_payload["subscribedPrincipals"][0]["id"]
-  access_requestor_project_name = get_project_name(access_requestor_project_id)
-
-  return access_requestor_project_name
-
-
-def get_data_owner_project_name(request_payload):
-  """
-  Get data owner project name
-  """
-  data_owner_project_id = request_payload["subscribedListings"][0]["ownerProjectId"]
-  data_owner_project_name = get_project_name(data_owner_project_id)
-
-  return data_owner_project_name
-
-
 def get_project_name(project_id):
   """
   Get project name
   """
-  project_name = None
   domain_id = get_application_domain_id()
+  project_name = entity_cache.get((domain_id, "project", project_id))
+  if project_name:
+    return project_name
+
   try:
-    project_name = dz_client.get_project(
+    project_name = utils.get_client("datazone").get_project(
       domainIdentifier=domain_id,
       identifier=project_id
     )['name']
+    entity_cache.put((domain_id, "project", project_id), project_name)
   except ClientError as err:
     logger.error(f"Exception {err}")
 
@@ -299,26 +373,110 @@ def get_iam_user_role_name(request_payload):
   Get IAM user role name
   """
   requestor_id = request_payload["requesterId"]
-  iam_role_arn = None
   domain_id = get_application_domain_id()
-  try:
-    iam_role_arn = dz_client.get_user_profile(
-      domainIdentifier=domain_id,
-      userIdentifier=requestor_id
-    )['details']['iam']
-  except ClientError as err:
-    logger.error(f"Exception {err}")
+  iam_role_arn = entity_cache.get((domain_id, "user_profile", requestor_id))
+  if not iam_role_arn:
+    try:
+      iam_role_arn = utils.get_client("datazone").get_user_profile(
+        domainIdentifier=domain_id,
+        userIdentifier=requestor_id
+      )['details']['iam']['arn']
+      entity_cache.put((domain_id, "user_profile", requestor_id), iam_role_arn)
+    except ClientError as err:
+      logger.error(f"Exception {err}")
+      return None
 
   iam_user_role_name = iam_role_arn.split('/')[-1]
 
   return iam_user_role_name
 
 
-def process_sqs_message(event):
+def timed_lookup(lookup, argument):
+  """
+  Run a lookup and return its result with its duration in milliseconds
+  """
+  start = perf_counter()
+  result = lookup(argument)
+
+  return result, round((perf_counter() - start) * 1000, 2)
+
+
+def run_lookups(lookups):
   """
-  Process SQS message
+  Run lookups concurrently on a bounded thread pool.
+
+  The lookups dictionary maps a key to a (function, argument) pair, the results are returned
+  under the same keys. All lookups share a deadline of ENRICHMENT_TIMEOUT_SECONDS. A lookup
+  that fails or times out resolves to None instead of failing the whole notification.
+  """
+  results = {}
+  timings = {}
+
+  executor = ThreadPoolExecutor(max_workers=max(1, min(ENRICHMENT_MAX_WORKERS, len(lookups))))
+  futures = {key: executor.submit(timed_lookup, lookup, argument) for key, (lookup, argument) in lookups.items()}
+  deadline = monotonic() + ENRICHMENT_TIMEOUT_SECONDS
+  for key, future in futures.items():
+    try:
+      results[key], timings[key] = future.result(timeout=max(0, deadline - monotonic()))
+    except FutureTimeoutError:
+      logger.error(f"Lookup {key} timed out after {ENRICHMENT_TIMEOUT_SECONDS} seconds")
+      results[key], timings[key] = None, None
+    except Exception as err:
+      logger.error(f"Lookup {key} failed: {err}")
+      results[key], timings[key] = None, None
+  # Do not wait for timed out lookups
+  executor.shutdown(wait=False, cancel_futures=True)
+
+  logger.info(f"Subscription request lookup timings (ms): {timings}")
+
+  return results
+
+
+def join_names(names):
+  """
+  Join entity names for a notification message
+  """
+  return ", ".join(str(name) for name in names)
+
+
+def enrich_subscription_request(request_payload):
+  """
+  Resolve every subscribed listing and principal of a subscription request.
+
+  Each distinct asset, project and requester is looked up once, concurrently. One
+  SubscriptionRequest is returned per data owner project, covering the listings it owns.
+  """
+  listings = request_payload["subscribedListings"]
+  requester_id = request_payload["requesterId"]
+  principal_ids = list(dict.fromkeys(principal["id"] for principal in request_payload["subscribedPrincipals"]))
+
+  owner_listing_ids = {}
+  for listing in listings:
+    owner_listing_ids.setdefault(listing["ownerProjectId"], {})[listing["id"]] = None
+
+  lookups = {("asset", listing["id"]): (get_data_product_name, listing["id"]) for listing in listings}
+  lookups.update({("project", project_id): (get_project_name, project_id)
+                  for project_id in list(owner_listing_ids) + principal_ids})
+  lookups[("user", requester_id)] = (get_iam_user_role_name, request_payload)
+  results = run_lookups(lookups)
+
+  access_requestor_project_name = join_names(results[("project", project_id)] for project_id in principal_ids)
+  subscription_requests = []
+  for owner_project_id, listing_ids in owner_listing_ids.items():
+    subscription_requests.append(SubscriptionRequest(
+      dataProductName=join_names(results[("asset", listing_id)] for listing_id in listing_ids),
+      dataOwnerProjectName=results[("project", owner_project_id)],
+      accessRequestorProjectName=access_requestor_project_name,
+      userName=results[("user", requester_id)]
+    ))
+
+  return subscription_requests
+
+
+def process_sqs_record(record):
+  """
+  Process a single SQS record
   """
-  record = event["Records"][0]
   message_type = record["messageAttributes"]["messageType"]["stringValue"]
 
   if message_type == "MemberAccountAssociation":
@@ -331,7 +489,6 @@ def process_sqs_message(event):
       member = Member(region=member_region, accountId=member_account_id, blueprintId=member_blueprint_id)
       put_ssm_parameter_blueprint_id_response = put_ssm_parameter_blueprint_id(member)
       send_bootstrapping_status_notification_response = send_bootstrapping_status_notification(record)
-      delete_message_response = delete_message(record)
       return put_ssm_parameter_blueprint_id_response
 
   else:
@@ -339,6 +496,60 @@ def process_sqs_message(event):
     raise ValueError(f"Unsupported message type: {message_type}")
 
 
+def process_subscription_request_records(project_name, records):
+  """
+  Send one digest for the buffered subscription requests of a data owner project
+  """
+  subscription_requests = [SubscriptionRequest(**json.loads(record["body"])) for record in records]
+
+  return send_subscription_request_digest(project_name, subscription_requests)
+
+
+def process_sqs_message(event):
+  """
+  Process all records of an SQS batch concurrently and report the failed ones.
+
+  Buffered subscription requests are grouped by data owner project and sent as one digest
+  per project. Successful records are deleted by Lambda, only the records listed in
+  batchItemFailures return to the queue. A record without the attributes needed to group it
+  fails on its own.
+  """
+  records = event["Records"]
+  tasks = []
+  subscription_request_records = {}
+  batch_item_failures = []
+  for record in records:
+    try:
+      message_attributes = record["messageAttributes"]
+      if message_attributes["messageType"]["stringValue"] == "SubscriptionRequest":
+        project_name = message_attributes["dataOwnerProjectName"]["stringValue"]
+        subscription_request_records.setdefault(project_name, []).append(record)
+      else:
+        tasks.append((process_sqs_record, (record,), [record["messageId"]]))
+    except (KeyError, TypeError) as err:
+      logger.error(f"Failed to classify message {record['messageId']}: missing attribute {err}")
+      batch_item_failures.append({"itemIdentifier": record["messageId"]})
+
+  for project_name, project_records in subscription_request_records.items():
+    tasks.append((process_subscription_request_records, (project_name, project_records),
+                  [record["messageId"] for record in project_records]))
+
+  max_workers = max(1, min(SQS_BATCH_MAX_WORKERS, len(tasks)))
+  with ThreadPoolExecutor(max_workers=max_workers) as executor:
+    futures = {executor.submit(function, *args): message_ids for function, args, message_ids in tasks}
+    for future in as_completed(futures):
+      message_ids = futures[future]
+      try:
+        future.result()
+      except Exception as err:
+        logger.error(f"Failed to process messages {message_ids}: {err}")
+        batch_item_failures.extend({"itemIdentifier": message_id} for message_id in message_ids)
+
+  logger.info(f"Processed {len(records)} messages, {len(batch_item_failures)} failed")
+
+  return {"batchItemFailures": batch_item_failures}
+
+
 def process_event_bridge_event(event):
   """
   Process EventBridge event
@@ -352,16 +563,15 @@ def process_event_bridge_event(event):
 
   if detail_type == "Subscription Request Created":
     request_payload = event["detail"]["data"]
-    data_product_name = get_data_product_name(request_payload)
-    data_owner_project_name = get_data_owner_project_name(request_payload)
-    access_requestor_project_name = get_access_requestor_project_name(request_payload)
-    iam_user_role_name = get_iam_user_role_name(request_payload)
-    subscription_request = SubscriptionRequest(dataProductName=data_product_name,
-                                               dataOwnerProjectName=data_owner_project_name,
-                                               accessRequestorProjectName=access_requestor_project_name,
-                                               userName=iam_user_role_name)
-
-    send_subscription_request_notification(subscription_request)
+    entity_cache.reset_stats()
+    subscription_requests = enrich_subscription_request(request_payload)
+    logger.info(f"Entity cache stats: {entity_cache.stats()}")
+
+    for subscription_request in subscription_requests:
+      if is_digest_delivery(subscription_request):
+        buffer_subscription_request(subscription_request)
+      else:
+        send_subscription_request_notification(subscription_request)
 
 
 @tracer.capture_lambda_handler
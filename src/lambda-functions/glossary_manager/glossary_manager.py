@@ -21,6 +21,19 @@ This Lambda function manages the glossary for a data solution.
 Environment Variables:
     LOG_LEVEL (str): The log level for the function (e.g., "INFO", "DEBUG", "WARNING").
     TRACER_DISABLED (bool): Whether to disable the AWS X-Ray tracer.
+    GLOSSARY_MAX_WORKERS (int, optional): The number of concurrent DataZone calls. Defaults to 10.
+    GLOSSARY_TERM_BATCH_SIZE (int, optional): The number of glossary terms created per batch. Defaults to 100.
+    DATAZONE_REQUESTS_PER_SECOND (float, optional): The client-side limit of DataZone calls per second.
+        Defaults to 10.
+    GLOSSARY_CHECKPOINT_SECONDS (float, optional): The interval between checkpoints of the glossary id
+        mapping while glossary terms are created. Defaults to 30.
+    GLOSSARY_MAPPING_SHARD_SIZE (int, optional): The number of characters per glossary id mapping shard.
+        Defaults to 4000, below the 4 KB limit of standard SSM parameters. Each term costs about 18
+        characters, so a glossary of 30k terms needs about 136 shards and one of 100k terms about 453.
+        Loading a mapping takes one GetParametersByPath call per 10 shards, which limits glossaries
+        to a few tens of thousands of terms.
+    GLOSSARY_MAPPING_STORE_FILE (str, optional): Keep the glossary id mappings in this local JSON file
+        instead of SSM Parameter Store, for local runs.
 
 Functions:
     lambda_handler(event, context): The entry point for the Lambda function.
@@ -29,26 +42,51 @@ Classes:
     Glossary: A dataclass representing the glossary for a data solution.
         Attributes:
             projectGlossaries (dict): A dictionary containing the glossaries for the data solution.
+    GlossaryUpdatePlan: A dataclass representing the create, update and delete calls of a glossary update.
+    GlossaryIndex: A dataclass representing the name to id mappings of the glossaries and their terms.
+        Attributes:
+            glossaryIds (dict): Glossary ids keyed by glossary name.
+            termIds (dict): Glossary term ids keyed by term name, keyed by glossary id.
+    SsmMappingStore: Stores the glossary id mappings in SSM Parameter Store.
+    LocalMappingStore: Stores the glossary id mappings in a local JSON file.
 """
 
+import io
 import os
+import csv
 import json
+import zlib
+import base64
+import hashlib
+import threading
 from uuid import uuid4
-from dataclasses import dataclass
+from functools import partial
+from time import monotonic
+from contextlib import suppress
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from common import utils
 from botocore.exceptions import ClientError
 
 
-# Set logger, tracer, and session
+GLOSSARY_MAX_WORKERS = int(os.environ.get("GLOSSARY_MAX_WORKERS", 10))
+GLOSSARY_TERM_BATCH_SIZE = int(os.environ.get("GLOSSARY_TERM_BATCH_SIZE", 100))
+GLOSSARY_CHECKPOINT_SECONDS = float(os.environ.get("GLOSSARY_CHECKPOINT_SECONDS", 30))
+GLOSSARY_MAPPING_SHARD_SIZE = int(os.environ.get("GLOSSARY_MAPPING_SHARD_SIZE", 4000))
+GLOSSARY_MAPPING_STORE_FILE = os.environ.get("GLOSSARY_MAPPING_STORE_FILE")
+GLOSSARY_MAPPING_FORMAT_VERSION = 2
+GLOSSARY_MAPPING_MAX_JOURNAL_SEGMENTS = 32
+MAPPING_STORE_MAX_WORKERS = 4
+DELETE_PARAMETERS_MAX_NAMES = 10
+SEARCH_MAX_RESULTS = 50
+GLOSSARY_IMPORT_REQUIRED_FIELDS = ("GlossaryName", "Name", "ShortDescription", "LongDescription")
+
+# Set logger and tracer
 log_level = os.environ.get("LOG_LEVEL", "INFO")
 tracer_disabled = os.environ.get("TRACER_DISABLED", False)
 logger = utils.get_logger(log_level=log_level, service_name="glossary_manager")
 tracer = utils.get_tracer(tracer_disabled=tracer_disabled, service_name="glossary_manager")
-session = utils.get_session()
-
-# Initiate clients
-dz_client = session.client("datazone")
-ssm_client = session.client("ssm")
 
 
 @dataclass
@@ -63,17 +101,159 @@ class Glossary:
           that stores the glossary information.
       glossaryTermParamStoreNamePrefix (str): The prefix for the names of AWS Systems Manager
           Parameter Store parameters that store glossary term information.
+      glossaryImportUri (str): The S3 URI or local path of a JSON Lines or CSV file of glossary
+          terms to import, if any.
+      reconcile (bool): Whether creates and updates converge from the live DataZone state
+          instead of the glossary id mapping.
   """
   projectGlossaries: dict
   glossaryParamStoreName: str
   glossaryTermParamStoreNamePrefix: str
+  glossaryImportUri: str = None
+  reconcile: bool = False
+
+
+@dataclass
+class GlossaryUpdatePlan:
+  """
+  A class representing the minimal set of changes turning old glossaries into new ones, matched by name.
+
+  Attributes:
+      createGlossaries (list): New glossaries, with all their terms.
+      updateGlossaries (list): Glossaries whose description changed.
+      deleteGlossaries (list): Removed glossaries, with all their terms.
+      createTerms (list): (glossary name, term) pairs of terms added to existing glossaries.
+      updateTerms (list): (glossary name, term) pairs of terms whose descriptions changed.
+      deleteTerms (list): (glossary name, term) pairs of terms removed from existing glossaries.
+  """
+  createGlossaries: list = field(default_factory=list)
+  updateGlossaries: list = field(default_factory=list)
+  deleteGlossaries: list = field(default_factory=list)
+  createTerms: list = field(default_factory=list)
+  updateTerms: list = field(default_factory=list)
+  deleteTerms: list = field(default_factory=list)
+
+
+@dataclass
+class GlossaryIndex:
+  """
+  A class representing the name to id mappings of the glossaries and glossary terms of a project.
+
+  Attributes:
+      glossaryIds (dict): Glossary ids keyed by glossary name.
+      termIds (dict): Dictionaries of glossary term ids keyed by term name, keyed by glossary id.
+      header (dict): The header of the stored mapping revision, None when there is none.
+      storedMappings (dict): The mappings as last read or written, None for the StringList format.
+      storedParameterNames (set): The shard parameters as last read or written.
+  """
+  glossaryIds: dict = field(default_factory=dict)
+  termIds: dict = field(default_factory=dict)
+  header: dict = None
+  storedMappings: dict = None
+  storedParameterNames: set = field(default_factory=set)
+
+
+class SsmMappingStore:
+  """
+  A class storing glossary id mapping parameters in AWS Systems Manager Parameter Store.
+  """
+
+  def get(self, name):
+    """
+    Return the value of a parameter, or None when it does not exist
+    """
+    return utils.get_parameters([name], force_fetch=True).get(name)
+
+  def get_by_path(self, path):
+    """
+    Return the values of all parameters under a path, keyed by name
+    """
+    return utils.prefetch_parameters_by_path(path)
+
+  def put(self, values):
+    """
+    Create or overwrite parameters
+    """
+    # StringList keeps the type of the mapping parameters created by earlier releases
+    utils.run_concurrently(
+      put_ssm_parameter,
+      [(name, value, 'StringList' if value.startswith("{") else 'String') for name, value in values.items()],
+      MAPPING_STORE_MAX_WORKERS)
+
+  def delete(self, names):
+    """
+    Delete parameters
+    """
+    delete_ssm_parameters(list(names))
+
+
+class LocalMappingStore:
+  """
+  A class storing glossary id mapping parameters in a local JSON file, standing in for SSM.
+
+  Attributes:
+      path (str): The path of the JSON file.
+  """
+
+  def __init__(self, path):
+    self.path = path
+    self._lock = threading.Lock()
+
+  def _read(self):
+    if not os.path.exists(self.path):
+      return {}
+    with open(self.path, encoding="utf-8") as mapping_file:
+      return json.load(mapping_file)
+
+  def _write(self, values):
+    with open(self.path, "w", encoding="utf-8") as mapping_file:
+      json.dump(values, mapping_file)
+
+  def get(self, name):
+    """
+    Return the value of a parameter, or None when it does not exist
+    """
+    with self._lock:
+      return self._read().get(name)
+
+  def get_by_path(self, path):
+    """
+    Return the values of all parameters under a path, keyed by name
+    """
+    with self._lock:
+      return {name: value for name, value in self._read().items() if name.startswith(f"{path}/")}
+
+  def put(self, values):
+    """
+    Create or overwrite parameters
+    """
+    with self._lock:
+      self._write({**self._read(), **values})
+
+  def delete(self, names):
+    """
+    Delete parameters
+    """
+    with self._lock:
+      stored_values = self._read()
+      for name in names:
+        stored_values.pop(name, None)
+      self._write(stored_values)
+
+
+mapping_store = LocalMappingStore(GLOSSARY_MAPPING_STORE_FILE) if GLOSSARY_MAPPING_STORE_FILE else SsmMappingStore()
 
 
 def on_create(domain_id, project_id, glossary):
   """
   Initiate creation of glossary for the data solution.
   """
-  response = create_project_glossary(domain_id, project_id, glossary)
+  if glossary.reconcile:
+    response = reconcile_project_glossary(domain_id, project_id, glossary, [], "ENABLED")
+  else:
+    response = create_project_glossary(domain_id, project_id, glossary)
+  if glossary.glossaryImportUri:
+    import_response = import_project_glossary(domain_id, project_id, glossary)
 
   return response
 
@@ -82,17 +262,21 @@ def on_delete(domain_id, glossary):
   """
   Initiate deletion of glossary for the data solution.
   """
-  update_response = update_project_glossary(domain_id, glossary, glossary.projectGlossaries, "DISABLED")
   response = delete_project_glossary(domain_id, glossary)
 
   return response
 
 
-def on_update(domain_id, glossary, old_project_glossaries, status):
+def on_update(domain_id, project_id, glossary, old_project_glossaries, status):
   """
   Initiate update of glossary for the data solution.
   """
-  response = update_project_glossary(domain_id, glossary, old_project_glossaries, status)
+  if glossary.reconcile:
+    response = reconcile_project_glossary(domain_id, project_id, glossary, old_project_glossaries, status)
+  else:
+    response = update_project_glossary(domain_id, project_id, glossary, old_project_glossaries, status)
+  if glossary.glossaryImportUri:
+    import_response = import_project_glossary(domain_id, project_id, glossary)
 
   return response
 
@@ -101,8 +285,9 @@ def create_glossary(domain_id, project_id, glossary_name, glossary_description):
   """
   Create a glossary for the data solution.
   """
+  utils.datazone_rate_limiter.acquire()
   try:
-    response = dz_client.create_glossary(
+    response = utils.get_client("datazone").create_glossary(
       clientToken=str(uuid4()),
       description=glossary_description,
       domainIdentifier=domain_id,
@@ -122,8 +307,9 @@ def update_glossary(domain_id, glossary_id, glossary_name, glossary_description,
   """
   Update a glossary for the data solution.
   """
+  utils.datazone_rate_limiter.acquire()
   try:
-    response = dz_client.update_glossary(
+    response = utils.get_client("datazone").update_glossary(
       clientToken=str(uuid4()),
       description=glossary_description,
       domainIdentifier=domain_id,
@@ -143,8 +329,9 @@ def delete_glossary(domain_id, glossary_id, glossary_name):
   """
   Delete a glossary for the data solution.
   """
+  utils.datazone_rate_limiter.acquire()
   try:
-    response = dz_client.delete_glossary(
+    response = utils.get_client("datazone").delete_glossary(
       domainIdentifier=domain_id,
       identifier=glossary_id,
     )
@@ -160,8 +347,9 @@ def create_glossary_term(domain_id, glossary_id, long_description, name, short_d
   """
   Create a glossary term for the data solution.
   """
+  utils.datazone_rate_limiter.acquire()
   try:
-    response = dz_client.create_glossary_term(
+    response = utils.get_client("datazone").create_glossary_term(
       clientToken=str(uuid4()),
       domainIdentifier=domain_id,
       glossaryIdentifier=glossary_id,
@@ -182,8 +370,9 @@ def update_glossary_term(domain_id, glossary_id, glossary_term_id, long_descript
   """
   Update a glossary term for the data solution.
   """
+  utils.datazone_rate_limiter.acquire()
   try:
-    response = dz_client.update_glossary_term(
+    response = utils.get_client("datazone").update_glossary_term(
       domainIdentifier=domain_id,
       glossaryIdentifier=glossary_id,
       identifier=glossary_term_id,
@@ -204,8 +393,9 @@ def delete_glossary_term(domain_id, glossary_term_id, name):
   """
   Delete a glossary term for the data solution.
   """
+  utils.datazone_rate_limiter.acquire()
   try:
-    response = dz_client.delete_glossary_term(
+    response = utils.get_client("datazone").delete_glossary_term(
       domainIdentifier=domain_id,
       identifier=glossary_term_id
     )
@@ -217,169 +407,761 @@ def delete_glossary_term(domain_id, glossary_term_id, name):
   return response
 
 
+def set_glossary_status(domain_id, glossary_id, glossary_name, status):
+  """
+  Set the status of a glossary, leaving its name and description unchanged.
+  """
+  utils.datazone_rate_limiter.acquire()
+  try:
+    response = utils.get_client("datazone").update_glossary(
+      clientToken=str(uuid4()),
+      domainIdentifier=domain_id,
+      identifier=glossary_id,
+      status=status
+    )
+    logger.info(f"Glossary {glossary_name} set to {status}!")
+  except ClientError as err:
+    logger.error(f"Exception {err}")
+    raise err
+
+  return response
+
+
+def set_glossary_term_status(domain_id, glossary_term_id, name, status):
+  """
+  Set the status of a glossary term, leaving its name and descriptions unchanged.
+  """
+  utils.datazone_rate_limiter.acquire()
+  try:
+    response = utils.get_client("datazone").update_glossary_term(
+      domainIdentifier=domain_id,
+      identifier=glossary_term_id,
+      status=status
+    )
+    logger.info(f"Term {name} set to {status}!")
+  except ClientError as err:
+    logger.error(f"Exception {err}")
+    raise err
+
+  return response
+
+
 def create_project_glossary(domain_id, project_id, glossary: Glossary):
   """
-  Create project glossary
-  """
-  glossary_param_store_value = []
-  glossary_term_param_store_prefix = glossary.glossaryTermParamStoreNamePrefix
-  glossary_param_store_name = glossary.glossaryParamStoreName
-  for glossary in glossary.projectGlossaries:
-    glossary_name = glossary["GlossaryName"]
-    glossary_description = glossary["GlossaryDescription"]
-    glossary_terms = glossary["GlossaryTerms"]
-
-    glossary_create_response = create_glossary(domain_id, project_id, glossary_name, glossary_description)
-    glossary_id = glossary_create_response["id"]
-    glossary_param_store_value.append(f"{glossary_name}:{glossary_id}")
-
-    glossary_term_param_store_value = []
-    for term in glossary_terms:
-      name = term["Name"]
-      long_description = term["LongDescription"]
-      short_description = term["ShortDescription"]
-      glossary_term_create_response = create_glossary_term(domain_id, glossary_id, long_description, name,
-                                                           short_description)
-      glossary_term_id = glossary_term_create_response["id"]
-      glossary_term_param_store_value.append(f"{name}:{glossary_term_id}")
-
-    glossary_term_param_store_name = f"{glossary_term_param_store_prefix}/{glossary_id}"
-    glossary_term_param_store_value = ",".join(glossary_term_param_store_value)
-    update_ssm_parameter_response = put_ssm_parameter(glossary_term_param_store_name, glossary_term_param_store_value)
-
-  glossary_param_store_value = ",".join(glossary_param_store_value)
-  update_ssm_parameter_response = put_ssm_parameter(glossary_param_store_name, glossary_param_store_value)
-
-  return {'statusCode': 200, 'body': json.dumps(glossary_param_store_value)}
-
-
-def update_project_glossary(domain_id, glossary: Glossary, old_project_glossaries, status):
-  """
-  Update project glossary
-  """
-  glossary_ids = []
-  glossary_term_param_store_prefix = glossary.glossaryTermParamStoreNamePrefix
-  glossary_param_store_name = glossary.glossaryParamStoreName
-  for (glossary, old_glossary) in zip(glossary.projectGlossaries, old_project_glossaries):
-    glossary_name = glossary["GlossaryName"]
-    glossary_description = glossary["GlossaryDescription"]
-    glossary_terms = glossary["GlossaryTerms"]
-    old_glossary_name = old_glossary["GlossaryName"]
-    old_glossary_terms = old_glossary["GlossaryTerms"]
-    glossary_id = get_glossary_id(old_glossary_name, glossary_param_store_name)
-
-    glossary_update_response = update_glossary(domain_id, glossary_id, glossary_name, glossary_description, status)
-    glossary_ids.append(glossary_id)
-    for (term, old_term) in zip(glossary_terms, old_glossary_terms):
-      name = term["Name"]
-      long_description = term["LongDescription"]
-      short_description = term["ShortDescription"]
-      old_term_name = old_term["Name"]
-      glossary_term_param_store_name = f"{glossary_term_param_store_prefix}/{glossary_id}"
-      glossary_term_id = get_glossary_term_id(old_term_name, glossary_term_param_store_name)
-      glossary_term_update_response = update_glossary_term(domain_id, glossary_id, glossary_term_id, long_description,
-                                                           name, short_description, status)
-
-  return {'statusCode': 200, 'body': json.dumps(glossary_ids)}
+  Create project glossary, resuming after the glossaries and terms of an earlier failed attempt
+  """
+  glossary_index = load_glossary_index(glossary)
+  create_glossaries(domain_id, project_id, glossary.projectGlossaries, glossary, glossary_index)
 
+  glossary_terms = ((glossary_index.glossaryIds[glossary_item["GlossaryName"]], term)
+                    for glossary_item in glossary.projectGlossaries for term in glossary_item["GlossaryTerms"])
+  create_glossary_terms(domain_id, glossary_terms, glossary, glossary_index)
+  save_glossary_index(glossary, glossary_index)
 
-def delete_project_glossary(domain_id, glossary: Glossary):
+  return {'statusCode': 200, 'body': json.dumps(format_name_id_list(glossary_index.glossaryIds))}
+
+
+def create_glossaries(domain_id, project_id, glossary_items, glossary: Glossary, glossary_index):
   """
-  Delete project glossary
+  Create the glossaries missing from the glossary index concurrently and checkpoint their ids.
+
+  The ids of the glossaries created are checkpointed even when some creations fail, whatever the
+  error, and the first failure is raised afterwards.
   """
-  glossary_param_store_value = []
-  glossary_term_param_store_prefix = glossary.glossaryTermParamStoreNamePrefix
-  glossary_param_store_name = glossary.glossaryParamStoreName
-  for glossary_item in glossary.projectGlossaries:
-    glossary_name = glossary_item["GlossaryName"]
-    glossary_terms = glossary_item["GlossaryTerms"]
-    glossary_id = get_glossary_id(glossary_name, glossary_param_store_name)
+  missing_glossary_items = [glossary_item for glossary_item in glossary_items
+                            if glossary_item["GlossaryName"] not in glossary_index.glossaryIds]
+  if not missing_glossary_items:
+    return
+
+  with ThreadPoolExecutor(max_workers=GLOSSARY_MAX_WORKERS) as executor:
+    pending_glossaries = [
+      (glossary_item["GlossaryName"], executor.submit(create_glossary, domain_id, project_id,
+                                                      glossary_item["GlossaryName"], glossary_item["GlossaryDescription"]))
+      for glossary_item in missing_glossary_items]
+
+  failures = []
+  for glossary_name, future in pending_glossaries:
+    try:
+      glossary_id = future.result()["id"]
+    except Exception as err:
+      failures.append(err)
+      continue
+    glossary_index.glossaryIds[glossary_name] = glossary_id
+    glossary_index.termIds.setdefault(glossary_id, {})
+
+  save_glossary_index(glossary, glossary_index)
+  if failures:
+    raise failures[0]
+
+
+def create_glossary_terms(domain_id, glossary_terms, glossary: Glossary, glossary_index):
+  """
+  Create glossary terms concurrently in pipelined batches of GLOSSARY_TERM_BATCH_SIZE.
 
-    glossary_term_param_store_name = f"{glossary_term_param_store_prefix}/{glossary_id}"
-    for term in glossary_terms:
-      name = term["Name"]
-      glossary_term_id = get_glossary_term_id(name, glossary_term_param_store_name)
-      glossary_term_delete_response = delete_glossary_term(domain_id, glossary_term_id, name)
+  glossary_terms is an iterable of (glossary id, term) pairs, consumed lazily: the next batch is
+  read and submitted while the previous one is still being created, so at most two batches are
+  held in memory. Terms that already have an id in the glossary index are skipped.
 
-    glossary_delete_response = delete_glossary(domain_id, glossary_id, glossary_name)
-    delete_ssm_parameter_response = delete_ssm_parameter(glossary_term_param_store_name)
+  Term ids are added to the glossary index as each batch completes and checkpointed every
+  GLOSSARY_CHECKPOINT_SECONDS. On any failure, including botocore timeouts and connection
+  errors, the ids of all terms created are checkpointed before the error is raised, so a retry
+  resumes where this attempt stopped.
+  """
+  created_count = 0
+  pending_terms = []
+  checkpointed_at = monotonic()
+  glossary_terms = ((glossary_id, term) for glossary_id, term in glossary_terms
+                    if not glossary_index.termIds.get(glossary_id, {}).get(term["Name"]))
+  try:
+    with ThreadPoolExecutor(max_workers=GLOSSARY_MAX_WORKERS) as executor:
+      while batch := list(islice(glossary_terms, GLOSSARY_TERM_BATCH_SIZE)):
+        previous_count = len(pending_terms)
+        pending_terms.extend(
+          (glossary_id, term["Name"], executor.submit(create_glossary_term, domain_id, glossary_id,
+                                                      term["LongDescription"], term["Name"], term["ShortDescription"]))
+          for glossary_id, term in batch)
+        created_count += record_created_terms(pending_terms[:previous_count], glossary_index)
+        del pending_terms[:previous_count]
+        if created_count:
+          logger.info(f"Created {created_count} glossary terms")
+        if monotonic() - checkpointed_at >= GLOSSARY_CHECKPOINT_SECONDS:
+          save_glossary_index(glossary, glossary_index)
+          checkpointed_at = monotonic()
+      created_count += record_created_terms(pending_terms, glossary_index)
+  except Exception:
+    with suppress(Exception):
+      record_created_terms(pending_terms, glossary_index)
+    raise
+  finally:
+    save_glossary_index(glossary, glossary_index)
+
+  return created_count
+
+
+def record_created_terms(pending_terms, glossary_index):
+  """
+  Wait for submitted glossary term creations and add the ids of the terms created to the
+  glossary index. The first failure is raised once every creation is recorded.
+  """
+  failures = []
+  for glossary_id, name, future in pending_terms:
+    try:
+      glossary_index.termIds.setdefault(glossary_id, {})[name] = future.result()["id"]
+    except Exception as err:
+      failures.append(err)
 
-  delete_ssm_parameter_response = delete_ssm_parameter(glossary_param_store_name)
+  if failures:
+    raise failures[0]
 
-  return {'statusCode': 200, 'body': json.dumps(glossary_param_store_value)}
+  return len(pending_terms)
 
 
-def get_glossary_id(glossary_name, glossary_param_store_name):
+def open_glossary_import(import_uri):
   """
-  Get glossary id
+  Open a glossary import file, from S3 for s3://bucket/key URIs or else from the local filesystem,
+  as a text stream
   """
+  if not import_uri.startswith("s3://"):
+    return open(import_uri, encoding="utf-8", newline="")
+
+  bucket, _, key = import_uri[len("s3://"):].partition("/")
   try:
-    glossary_name_id_list = ssm_client.get_parameter(
-      Name=glossary_param_store_name,
-    )["Parameter"]["Value"].split(",")
+    response = utils.get_client("s3").get_object(Bucket=bucket, Key=key)
   except ClientError as err:
     logger.error(f"Exception {err}")
     raise err
 
-  for item in glossary_name_id_list:
-    item_list = item.split(":")
-    if item_list[0] == glossary_name:
-      glossary_id = item_list[1]
-      break
+  return io.TextIOWrapper(response["Body"], encoding="utf-8", newline="")
 
-  return glossary_id
 
+def read_glossary_records(import_file, import_uri):
+  """
+  Yield glossary term records one at a time from a JSON Lines file, or a CSV file with a header row
+  """
+  if import_uri.lower().endswith(".csv"):
+    records = csv.DictReader(import_file)
+  else:
+    records = (json.loads(line) for line in import_file if line.strip())
 
-def get_glossary_term_id(glossary_term_name, glossary_term_param_store_name):
+  for record_number, record in enumerate(records, start=1):
+    missing_fields = [name for name in GLOSSARY_IMPORT_REQUIRED_FIELDS if not record.get(name)]
+    if missing_fields:
+      raise ValueError(f"Glossary import record {record_number} of {import_uri} is missing {missing_fields}")
+    yield record
+
+
+def import_project_glossary(domain_id, project_id, glossary: Glossary):
   """
-  Get glossary term id
+  Stream the glossary terms of glossary.glossaryImportUri into the project glossaries.
+
+  Glossaries are created on their first record. Terms already in the glossary id mapping, or
+  repeated in the file, are skipped, so an import run again only creates the new terms.
+  """
+  glossary_index = load_glossary_index(glossary)
+  skipped_count = 0
+
+  def new_glossary_terms(records):
+    nonlocal skipped_count
+    for record in records:
+      glossary_name = record["GlossaryName"]
+      if glossary_name not in glossary_index.glossaryIds:
+        glossary_create_response = create_glossary(domain_id, project_id, glossary_name,
+                                                   record.get("GlossaryDescription") or glossary_name)
+        glossary_index.glossaryIds[glossary_name] = glossary_create_response["id"]
+      glossary_id = glossary_index.glossaryIds[glossary_name]
+      term_ids = glossary_index.termIds.setdefault(glossary_id, {})
+      if record["Name"] in term_ids:
+        skipped_count += 1
+        continue
+      # Reserved until the term is created, so that a repeated record is skipped
+      term_ids[record["Name"]] = None
+      yield glossary_id, record
+
+  with open_glossary_import(glossary.glossaryImportUri) as import_file:
+    created_count = create_glossary_terms(
+      domain_id, new_glossary_terms(read_glossary_records(import_file, glossary.glossaryImportUri)), glossary,
+      glossary_index)
+
+  save_glossary_index(glossary, glossary_index)
+  logger.info(f"Imported {created_count} glossary terms from {glossary.glossaryImportUri}, "
+              f"skipped {skipped_count} existing terms")
+
+  return {'statusCode': 200, 'body': json.dumps({"createdTerms": created_count, "skippedTerms": skipped_count})}
+
+
+def plan_glossary_update(old_project_glossaries, project_glossaries):
+  """
+  Diff old and new glossaries by name into a GlossaryUpdatePlan.
+  """
+  plan = GlossaryUpdatePlan()
+  old_glossaries = {old_glossary["GlossaryName"]: old_glossary for old_glossary in old_project_glossaries}
+  glossary_names = {glossary_item["GlossaryName"] for glossary_item in project_glossaries}
+
+  for glossary_item in project_glossaries:
+    glossary_name = glossary_item["GlossaryName"]
+    old_glossary = old_glossaries.get(glossary_name)
+    if not old_glossary:
+      plan.createGlossaries.append(glossary_item)
+      continue
+    if glossary_item["GlossaryDescription"] != old_glossary["GlossaryDescription"]:
+      plan.updateGlossaries.append(glossary_item)
+
+    old_terms = {old_term["Name"]: old_term for old_term in old_glossary["GlossaryTerms"]}
+    term_names = {term["Name"] for term in glossary_item["GlossaryTerms"]}
+    for term in glossary_item["GlossaryTerms"]:
+      old_term = old_terms.get(term["Name"])
+      if not old_term:
+        plan.createTerms.append((glossary_name, term))
+      elif (term["LongDescription"], term["ShortDescription"]) != \
+          (old_term["LongDescription"], old_term["ShortDescription"]):
+        plan.updateTerms.append((glossary_name, term))
+    plan.deleteTerms.extend((glossary_name, old_term) for old_term in old_glossary["GlossaryTerms"]
+                            if old_term["Name"] not in term_names)
+
+  plan.deleteGlossaries = [old_glossary for old_glossary in old_project_glossaries
+                           if old_glossary["GlossaryName"] not in glossary_names]
+
+  return plan
+
+
+def update_project_glossary(domain_id, project_id, glossary: Glossary, old_project_glossaries, status):
+  """
+  Update project glossary with the minimal set of DataZone calls
   """
-  glossary_term_id = None
+  plan = plan_glossary_update(old_project_glossaries, glossary.projectGlossaries)
+  glossary_index = load_glossary_index(glossary)
+
+  return apply_glossary_update_plan(domain_id, project_id, glossary, glossary_index, plan, status)
+
+
+def apply_glossary_update_plan(domain_id, project_id, glossary: Glossary, glossary_index, plan, status):
+  """
+  Make the DataZone calls of a GlossaryUpdatePlan and store the resulting glossary id mapping
+  """
+  logger.info(f"Glossary update plan: {len(plan.createGlossaries)} glossaries to create, "
+              f"{len(plan.updateGlossaries)} to update, {len(plan.deleteGlossaries)} to delete, "
+              f"{len(plan.createTerms)} terms to create, {len(plan.updateTerms)} to update, "
+              f"{len(plan.deleteTerms)} to delete")
+
+  # Removed terms and glossaries first, so that re-added names do not conflict. Removed
+  # glossaries lose every term of the mapping, imported ones included.
+  delete_terms = [(glossary_index.glossaryIds.get(glossary_name), term["Name"]) for glossary_name, term in plan.deleteTerms]
+  for old_glossary in plan.deleteGlossaries:
+    glossary_id = glossary_index.glossaryIds.get(old_glossary["GlossaryName"])
+    delete_terms.extend((glossary_id, name) for name in glossary_index.termIds.get(glossary_id, {}))
+  delete_glossary_items(domain_id, glossary, glossary_index, delete_terms,
+                        [old_glossary["GlossaryName"] for old_glossary in plan.deleteGlossaries])
+
+  create_glossaries(domain_id, project_id, plan.createGlossaries, glossary, glossary_index)
+
+  utils.run_concurrently(
+    update_glossary,
+    [(domain_id, get_glossary_id(glossary_index, glossary_item["GlossaryName"]), glossary_item["GlossaryName"],
+      glossary_item["GlossaryDescription"], status) for glossary_item in plan.updateGlossaries],
+    GLOSSARY_MAX_WORKERS)
+
+  update_terms = []
+  for glossary_name, term in plan.updateTerms:
+    glossary_id = get_glossary_id(glossary_index, glossary_name)
+    update_terms.append((domain_id, glossary_id, get_glossary_term_id(glossary_index, glossary_id, term["Name"]),
+                         term["LongDescription"], term["Name"], term["ShortDescription"], status))
+  utils.run_concurrently(update_glossary_term, update_terms, GLOSSARY_MAX_WORKERS)
+
+  create_terms = [(get_glossary_id(glossary_index, glossary_name), term) for glossary_name, term in plan.createTerms]
+  create_terms.extend((glossary_index.glossaryIds[glossary_item["GlossaryName"]], term)
+                      for glossary_item in plan.createGlossaries for term in glossary_item["GlossaryTerms"])
+  create_glossary_terms(domain_id, create_terms, glossary, glossary_index)
+
+  save_glossary_index(glossary, glossary_index)
+
+  return {'statusCode': 200, 'body': json.dumps(list(glossary_index.glossaryIds.values()))}
+
+
+def search_project_items(domain_id, project_id, search_scope, item_type):
+  """
+  Return the DataZone items of a search scope owned by a project, following every result page
+  """
+  items = []
   try:
-    glossary_term_name_id_list = ssm_client.get_parameter(
-      Name=glossary_term_param_store_name,
-    )["Parameter"]["Value"].split(",")
+    paginator = utils.get_client("datazone").get_paginator("search")
+    for page in paginator.paginate(domainIdentifier=domain_id, owningProjectIdentifier=project_id,
+                                   searchScope=search_scope, maxResults=SEARCH_MAX_RESULTS):
+      items.extend(item[item_type] for item in page["items"] if item_type in item)
+      utils.datazone_rate_limiter.acquire()
   except ClientError as err:
     logger.error(f"Exception {err}")
     raise err
 
-  for item in glossary_term_name_id_list:
-    item_list = item.split(":")
-    if item_list[0] == glossary_term_name:
-      glossary_term_id = item_list[1]
-      break
+  return items
 
-  return glossary_term_id
 
+def plan_glossary_reconciliation(live_glossaries, live_terms, old_project_glossaries, project_glossaries, status):
+  """
+  Compare live glossaries and terms with the glossary config into a GlossaryUpdatePlan.
 
-def put_ssm_parameter(parameter_name, parameter_value):
+  Missing items are created and items whose descriptions or status drifted are updated.
+  Live items are only deleted when they were removed from the config, so glossaries and
+  terms created outside of it, by hand or by an import, are left in place.
   """
-  Put SSM parameter
+  plan = GlossaryUpdatePlan()
+  old_glossaries = {old_glossary["GlossaryName"]: old_glossary for old_glossary in old_project_glossaries}
+  glossary_names = {glossary_item["GlossaryName"] for glossary_item in project_glossaries}
+
+  for glossary_item in project_glossaries:
+    glossary_name = glossary_item["GlossaryName"]
+    live_glossary = live_glossaries.get(glossary_name)
+    if not live_glossary:
+      plan.createGlossaries.append(glossary_item)
+      continue
+    if (live_glossary.get("description"), live_glossary["status"]) != (glossary_item["GlossaryDescription"], status):
+      plan.updateGlossaries.append(glossary_item)
+
+    glossary_live_terms = live_terms.get(live_glossary["id"], {})
+    term_names = {term["Name"] for term in glossary_item["GlossaryTerms"]}
+    for term in glossary_item["GlossaryTerms"]:
+      live_term = glossary_live_terms.get(term["Name"])
+      if not live_term:
+        plan.createTerms.append((glossary_name, term))
+      elif (live_term.get("longDescription"), live_term.get("shortDescription"), live_term["status"]) != \
+          (term["LongDescription"], term["ShortDescription"], status):
+        plan.updateTerms.append((glossary_name, term))
+    old_term_names = {old_term["Name"] for old_term in old_glossaries.get(glossary_name, {}).get("GlossaryTerms", [])}
+    plan.deleteTerms.extend((glossary_name, {"Name": name}) for name in glossary_live_terms
+                            if name in old_term_names - term_names)
+
+  for glossary_name in old_glossaries.keys() - glossary_names:
+    live_glossary = live_glossaries.get(glossary_name)
+    if live_glossary:
+      plan.deleteGlossaries.append({
+        "GlossaryName": glossary_name,
+        "GlossaryDescription": live_glossary.get("description"),
+        "GlossaryTerms": [{"Name": name} for name in live_terms.get(live_glossary["id"], {})]
+      })
+
+  return plan
+
+
+def reconcile_project_glossary(domain_id, project_id, glossary: Glossary, old_project_glossaries, status):
+  """
+  Converge the project glossaries with the glossary config from their live DataZone state.
+
+  The glossary id mapping is rebuilt from the live glossaries named in the old or new config and
+  their terms, so a lost, stale or unreadable mapping is repaired, and only the drifted items are
+  then created, updated or deleted. Other glossaries of the project, such as those created by hand,
+  are left out of the mapping so that deleting the glossary resource leaves them in place.
   """
   try:
-    response = ssm_client.put_parameter(
-      Name=parameter_name,
-      Value=parameter_value,
-      Type='StringList',
-      Overwrite=True
-    )
-    logger.info(f"SSM parameter {parameter_name} created or updated!")
+    glossary_index = load_glossary_index(glossary)
+  except (LookupError, ValueError) as err:
+    logger.warning(f"Rebuilding unreadable glossary id mapping: {err}")
+    glossary_index = GlossaryIndex(
+      storedParameterNames=set(mapping_store.get_by_path(glossary.glossaryTermParamStoreNamePrefix)))
+
+  config_glossary_names = {glossary_item["GlossaryName"]
+                           for glossary_item in [*old_project_glossaries, *glossary.projectGlossaries]}
+  live_glossaries = {item["name"]: item for item in search_project_items(domain_id, project_id, "GLOSSARY", "glossaryItem")
+                     if item["name"] in config_glossary_names}
+  live_glossary_ids = {item["id"] for item in live_glossaries.values()}
+  live_terms = {}
+  for item in search_project_items(domain_id, project_id, "GLOSSARY_TERM", "glossaryTermItem"):
+    if item["glossaryId"] in live_glossary_ids:
+      live_terms.setdefault(item["glossaryId"], {})[item["name"]] = item
+  logger.info(f"Found {len(live_glossaries)} live glossaries of the config and "
+              f"{sum(len(term_items) for term_items in live_terms.values())} of their glossary terms")
+
+  glossary_index.glossaryIds = {name: item["id"] for name, item in live_glossaries.items()}
+  glossary_index.termIds = {glossary_id: {name: item["id"] for name, item in term_items.items()}
+                            for glossary_id, term_items in live_terms.items()}
+
+  plan = plan_glossary_reconciliation(live_glossaries, live_terms, old_project_glossaries,
+                                      glossary.projectGlossaries, status)
+
+  return apply_glossary_update_plan(domain_id, project_id, glossary, glossary_index, plan, status)
+
+
+def teardown_glossary_term(domain_id, glossary_term_id, name):
+  """
+  Delete a glossary term, disabling it first when DataZone refuses to delete it while enabled
+  """
+  return utils.delete_with_disable_fallback(
+    partial(delete_glossary_term, domain_id, glossary_term_id, name),
+    partial(set_glossary_term_status, domain_id, glossary_term_id, name, "DISABLED"))
+
+
+def teardown_glossary(domain_id, glossary_id, glossary_name):
+  """
+  Delete a glossary, disabling it first when DataZone refuses to delete it while enabled
+  """
+  return utils.delete_with_disable_fallback(
+    partial(delete_glossary, domain_id, glossary_id, glossary_name),
+    partial(set_glossary_status, domain_id, glossary_id, glossary_name, "DISABLED"))
+
+
+def delete_glossary_items(domain_id, glossary: Glossary, glossary_index, glossary_terms, glossary_names):
+  """
+  Delete glossary terms concurrently, then the glossaries of glossary_names left without terms,
+  then store the glossary id mapping, deleting its parameters when no glossary is left.
+
+  glossary_terms is a list of (glossary id, term name) pairs. Items missing from the glossary
+  index, such as those deleted by an earlier attempt, are skipped. The first failure is raised
+  once every deletion was attempted and the deletions done are stored. Returns the duration of
+  each phase in seconds.
+  """
+  phase_seconds = {}
+  failures = []
+
+  started_at = monotonic()
+  term_ids = [(glossary_id, name, get_glossary_term_id(glossary_index, glossary_id, name))
+              for glossary_id, name in glossary_terms]
+  with ThreadPoolExecutor(max_workers=GLOSSARY_MAX_WORKERS) as executor:
+    pending_terms = [(glossary_id, name, executor.submit(teardown_glossary_term, domain_id, glossary_term_id, name))
+                     for glossary_id, name, glossary_term_id in term_ids if glossary_term_id]
+  for glossary_id, name, future in pending_terms:
+    if future.exception():
+      failures.append(future.exception())
+    else:
+      glossary_index.termIds[glossary_id].pop(name, None)
+  phase_seconds["terms"] = round(monotonic() - started_at, 3)
+
+  started_at = monotonic()
+  glossary_ids = [(glossary_name, glossary_index.glossaryIds[glossary_name]) for glossary_name in glossary_names
+                  if glossary_name in glossary_index.glossaryIds]
+  with ThreadPoolExecutor(max_workers=GLOSSARY_MAX_WORKERS) as executor:
+    pending_glossaries = [(glossary_name, glossary_id, executor.submit(teardown_glossary, domain_id, glossary_id, glossary_name))
+                          for glossary_name, glossary_id in glossary_ids if not glossary_index.termIds.get(glossary_id)]
+  for glossary_name, glossary_id, future in pending_glossaries:
+    if future.exception():
+      failures.append(future.exception())
+    else:
+      glossary_index.glossaryIds.pop(glossary_name)
+      glossary_index.termIds.pop(glossary_id, None)
+  phase_seconds["glossaries"] = round(monotonic() - started_at, 3)
+
+  started_at = monotonic()
+  save_glossary_index(glossary, glossary_index)
+  phase_seconds["mapping"] = round(monotonic() - started_at, 3)
+
+  logger.info(f"Deleted {len(pending_terms)} glossary terms and {len(pending_glossaries)} glossaries "
+              f"with {len(failures)} failures, phase durations in seconds: {phase_seconds}")
+  if failures:
+    raise failures[0]
+
+  return phase_seconds
+
+
+def delete_project_glossary(domain_id, glossary: Glossary):
+  """
+  Delete project glossary, with every glossary and glossary term in the glossary id mapping
+  """
+  glossary_index = load_glossary_index(glossary)
+  phase_seconds = delete_glossary_items(
+    domain_id, glossary, glossary_index,
+    [(glossary_id, name) for glossary_id in glossary_index.glossaryIds.values()
+     for name in glossary_index.termIds.get(glossary_id, {})],
+    list(glossary_index.glossaryIds))
+
+  return {'statusCode': 200, 'body': json.dumps(phase_seconds)}
+
+
+def parse_name_id_list(value):
+  """
+  Parse a comma-joined list of name:id pairs into a dictionary
+  """
+  name_ids = {}
+  for item in value.split(","):
+    name, _, item_id = item.partition(":")
+    if name:
+      name_ids[name] = item_id
+
+  return name_ids
+
+
+def format_name_id_list(name_ids):
+  """
+  Format a dictionary into a comma-joined list of name:id pairs
+  """
+  return ",".join(f"{name}:{item_id}" for name, item_id in name_ids.items())
+
+
+def snapshot_mappings(glossary_index):
+  """
+  Copy the mappings to store: the terms of existing glossaries, leaving out terms still being created
+  """
+  glossary_ids = set(glossary_index.glossaryIds.values())
+  term_mappings = {}
+  for glossary_id, term_ids in glossary_index.termIds.items():
+    created_term_ids = {name: glossary_term_id for name, glossary_term_id in term_ids.items() if glossary_term_id}
+    if created_term_ids and glossary_id in glossary_ids:
+      term_mappings[glossary_id] = created_term_ids
+
+  return {"glossaries": dict(glossary_index.glossaryIds), "terms": term_mappings}
+
+
+def diff_mappings(stored_mappings, mappings):
+  """
+  Return the journal entries turning the stored mappings into the current ones.
+
+  Entries are ["g", glossary name, glossary id] and ["t", glossary id, term name, term id],
+  with a None id for removed items.
+  """
+  stored_glossary_ids, glossary_ids = stored_mappings["glossaries"], mappings["glossaries"]
+  entries = [["g", name, glossary_id] for name, glossary_id in glossary_ids.items()
+             if stored_glossary_ids.get(name) != glossary_id]
+  entries.extend(["g", name, None] for name in stored_glossary_ids.keys() - glossary_ids.keys())
+
+  for glossary_id in stored_mappings["terms"].keys() | mappings["terms"].keys():
+    stored_term_ids = stored_mappings["terms"].get(glossary_id, {})
+    term_ids = mappings["terms"].get(glossary_id, {})
+    entries.extend(["t", glossary_id, name, glossary_term_id] for name, glossary_term_id in term_ids.items()
+                   if stored_term_ids.get(name) != glossary_term_id)
+    entries.extend(["t", glossary_id, name, None] for name in stored_term_ids.keys() - term_ids.keys())
+
+  return entries
+
+
+def apply_journal_entries(mappings, entries):
+  """
+  Apply journal entries to mappings in place
+  """
+  for entry in entries:
+    if entry[0] == "g":
+      _, name, glossary_id = entry
+      if glossary_id:
+        mappings["glossaries"][name] = glossary_id
+      else:
+        mappings["glossaries"].pop(name, None)
+      continue
+
+    _, glossary_id, name, glossary_term_id = entry
+    term_ids = mappings["terms"].setdefault(glossary_id, {})
+    if glossary_term_id:
+      term_ids[name] = glossary_term_id
+    else:
+      term_ids.pop(name, None)
+    if not term_ids:
+      mappings["terms"].pop(glossary_id)
+
+
+def split_mapping_shards(value):
+  """
+  Compress a JSON value and split it into parameter sized shards, returned with their checksum
+  """
+  payload = base64.b64encode(zlib.compress(json.dumps(value, separators=(",", ":")).encode("utf-8"), 9))
+  payload = payload.decode("ascii")
+  shards = [payload[offset:offset + GLOSSARY_MAPPING_SHARD_SIZE]
+            for offset in range(0, len(payload), GLOSSARY_MAPPING_SHARD_SIZE)]
+
+  return shards, hashlib.sha256(payload.encode("ascii")).hexdigest()
+
+
+def join_mapping_shards(shard_names, checksum, stored_values):
+  """
+  Reassemble, verify and decompress a JSON value from its shards
+  """
+  missing_shard_names = [shard_name for shard_name in shard_names if shard_name not in stored_values]
+  if missing_shard_names:
+    raise LookupError(f"Glossary id mapping is missing shards {missing_shard_names}")
+
+  payload = "".join(stored_values[shard_name] for shard_name in shard_names)
+  if hashlib.sha256(payload.encode("ascii")).hexdigest() != checksum:
+    raise ValueError(f"Glossary id mapping shards {shard_names[0]}.. failed their checksum")
+
+  return json.loads(zlib.decompress(base64.b64decode(payload)))
+
+
+def get_base_shard_names(shard_prefix, header):
+  """
+  Return the parameter names of the base document shards of a mapping revision
+  """
+  return [f"{shard_prefix}/r{header['revision']}/{index:05d}" for index in range(header["shards"])]
+
+
+def get_journal_shard_names(shard_prefix, header, segment_number):
+  """
+  Return the parameter names of the shards of a journal segment of a mapping revision
+  """
+  segment = header["journal"][segment_number]
+
+  return [f"{shard_prefix}/r{header['revision']}/j{segment_number:03d}-{index:05d}" for index in range(segment["shards"])]
+
+
+def load_glossary_index(glossary: Glossary):
+  """
+  Load the glossary and glossary term id mappings with one header read and one read by path.
+
+  A mapping revision is a base document followed by the journal segments written by checkpoints.
+  Mappings written by earlier releases, a StringList of name:id pairs per parameter, are read
+  as well and rewritten in the sharded format on the next save.
+  """
+  glossary_index = GlossaryIndex()
+  shard_prefix = glossary.glossaryTermParamStoreNamePrefix
+  try:
+    header_value = mapping_store.get(glossary.glossaryParamStoreName)
+    stored_values = mapping_store.get_by_path(shard_prefix)
   except ClientError as err:
     logger.error(f"Exception {err}")
     raise err
 
-  return response
+  glossary_index.storedParameterNames = set(stored_values)
+  if header_value is None:
+    glossary_index.storedMappings = snapshot_mappings(glossary_index)
+    return glossary_index
+
+  if not header_value.startswith("{"):
+    glossary_index.glossaryIds = parse_name_id_list(header_value)
+    for parameter_name, value in stored_values.items():
+      glossary_index.termIds[parameter_name[len(shard_prefix) + 1:]] = parse_name_id_list(value)
+    logger.info(f"Loaded glossary id mapping in the StringList format from {glossary.glossaryParamStoreName}")
+    return glossary_index
 
+  header = json.loads(header_value)
+  if header.get("version") != GLOSSARY_MAPPING_FORMAT_VERSION:
+    raise ValueError(f"Unsupported glossary id mapping format version {header.get('version')}")
+  header.setdefault("journal", [])
 
-def delete_ssm_parameter(parameter_name):
+  mappings = join_mapping_shards(get_base_shard_names(shard_prefix, header), header["sha256"], stored_values)
+  for segment_number, segment in enumerate(header["journal"]):
+    apply_journal_entries(mappings, join_mapping_shards(
+      get_journal_shard_names(shard_prefix, header, segment_number), segment["sha256"], stored_values))
+
+  glossary_index.glossaryIds = mappings["glossaries"]
+  glossary_index.termIds = mappings["terms"]
+  glossary_index.header = header
+  glossary_index.storedMappings = snapshot_mappings(glossary_index)
+
+  return glossary_index
+
+
+def save_glossary_index(glossary: Glossary, glossary_index):
+  """
+  Store the changes to the glossary and glossary term id mappings since the last load or save.
+
+  Changes are appended to the current revision as a journal segment, so a checkpoint costs as
+  many parameter writes as its changes need. Once the journal outgrows the base document, or
+  holds GLOSSARY_MAPPING_MAX_JOURNAL_SEGMENTS segments, the mappings are compacted into a new
+  revision instead. Shards are always written before the header that points to them, and the
+  shards of older revisions are deleted last, so readers always find a complete revision.
+  """
+  mappings = snapshot_mappings(glossary_index)
+  if not mappings["glossaries"]:
+    if glossary_index.header or glossary_index.storedParameterNames or glossary_index.storedMappings is None:
+      mapping_store.delete([glossary.glossaryParamStoreName, *glossary_index.storedParameterNames])
+    glossary_index.header = None
+    glossary_index.storedMappings = mappings
+    glossary_index.storedParameterNames = set()
+    return
+
+  if mappings == glossary_index.storedMappings:
+    return
+
+  shard_prefix = glossary.glossaryTermParamStoreNamePrefix
+  header = glossary_index.header
+  if header and len(header["journal"]) < GLOSSARY_MAPPING_MAX_JOURNAL_SEGMENTS:
+    entries = diff_mappings(glossary_index.storedMappings, mappings)
+    shards, checksum = split_mapping_shards(entries)
+    if len(shards) + sum(segment["shards"] for segment in header["journal"]) <= max(header["shards"], 8):
+      header = {**header, "journal": [*header["journal"], {"shards": len(shards), "sha256": checksum}]}
+      shard_names = get_journal_shard_names(shard_prefix, header, len(header["journal"]) - 1)
+      mapping_store.put(dict(zip(shard_names, shards)))
+      mapping_store.put({glossary.glossaryParamStoreName: json.dumps(header)})
+      logger.info(f"Saved {len(entries)} glossary id mapping changes to revision {header['revision']} "
+                  f"journal segment {len(header['journal'])}")
+
+      glossary_index.header = header
+      glossary_index.storedMappings = mappings
+      glossary_index.storedParameterNames.update(shard_names)
+      return
+
+  shards, checksum = split_mapping_shards(mappings)
+  header = {
+    "version": GLOSSARY_MAPPING_FORMAT_VERSION,
+    "revision": (header or {}).get("revision", 0) + 1,
+    "shards": len(shards),
+    "sha256": checksum,
+    "journal": []
+  }
+  shard_names = get_base_shard_names(shard_prefix, header)
+  mapping_store.put(dict(zip(shard_names, shards)))
+  mapping_store.put({glossary.glossaryParamStoreName: json.dumps(header)})
+  mapping_store.delete(list(glossary_index.storedParameterNames - set(shard_names)))
+  logger.info(f"Saved glossary id mapping revision {header['revision']} in {len(shards)} shards")
+
+  glossary_index.header = header
+  glossary_index.storedMappings = mappings
+  glossary_index.storedParameterNames = set(shard_names)
+
+
+def get_glossary_id(glossary_index, glossary_name):
+  """
+  Get glossary id
+  """
+  glossary_id = glossary_index.glossaryIds.get(glossary_name)
+  if not glossary_id:
+    raise LookupError(f"Glossary {glossary_name} not found in the glossary id mapping")
+
+  return glossary_id
+
+
+def get_glossary_term_id(glossary_index, glossary_id, glossary_term_name):
   """
-  Delete SSM parameter
+  Get glossary term id
+  """
+  return glossary_index.termIds.get(glossary_id, {}).get(glossary_term_name)
+
+
+def put_ssm_parameter(parameter_name, parameter_value, parameter_type='String'):
+  """
+  Put SSM parameter
   """
   try:
-    response = ssm_client.delete_parameter(
-      Name=parameter_name
+    response = utils.get_client("ssm").put_parameter(
+      Name=parameter_name,
+      Value=parameter_value,
+      Type=parameter_type,
+      Overwrite=True
     )
-    logger.info(f"SSM parameter {parameter_name} deleted!")
+    utils.invalidate_parameters(parameter_name)
+    logger.info(f"SSM parameter {parameter_name} created or updated!")
   except ClientError as err:
     logger.error(f"Exception {err}")
     raise err
@@ -387,6 +1169,23 @@ def delete_ssm_parameter(parameter_name):
   return response
 
 
+def delete_ssm_parameters(parameter_names):
+  """
+  Delete SSM parameters, ten per call
+  """
+  for batch_start in range(0, len(parameter_names), DELETE_PARAMETERS_MAX_NAMES):
+    batch = parameter_names[batch_start:batch_start + DELETE_PARAMETERS_MAX_NAMES]
+    try:
+      response = utils.get_client("ssm").delete_parameters(
+        Names=batch
+      )
+      utils.invalidate_parameters(*batch)
+      logger.info(f"SSM parameters {response['DeletedParameters']} deleted!")
+    except ClientError as err:
+      logger.error(f"Exception {err}")
+      raise err
+
+
 @tracer.capture_lambda_handler
 def lambda_handler(event, context):
   """
@@ -409,12 +1208,15 @@ def lambda_handler(event, context):
   project_glossaries = event["ResourceProperties"]["ProjectGlossaries"]
   glossary_param_store_name = event["ResourceProperties"]["GlossaryParameterStoreName"]
   glossary_term_param_store_name_prefix = event["ResourceProperties"]["GlossaryTermParameterStoreNamePrefix"]
+  glossary_import_uri = event["ResourceProperties"].get("GlossaryImportUri") or None
+  glossary_reconcile = str(event["ResourceProperties"].get("GlossaryReconcile", "false")).lower() == "true"
 
   are_valid_parameters = utils.check_input_parameters(request_type, domain_id, project_id, project_name, project_glossaries,
                                                       glossary_param_store_name)
 
   glossary = Glossary(projectGlossaries=project_glossaries, glossaryParamStoreName=glossary_param_store_name,
-                      glossaryTermParamStoreNamePrefix=glossary_term_param_store_name_prefix)
+                      glossaryTermParamStoreNamePrefix=glossary_term_param_store_name_prefix,
+                      glossaryImportUri=glossary_import_uri, reconcile=glossary_reconcile)
 
   if are_valid_parameters and "admin" not in glossary_project_name.lower():
     message = "Glossary project name must belong to the Admin Project! Check glossary config. file"
@@ -425,7 +1227,7 @@ def lambda_handler(event, context):
     response = on_create(domain_id, project_id, glossary)
   elif are_valid_parameters and request_type == "Update":
     old_project_glossaries = event["OldResourceProperties"]["ProjectGlossaries"]
-    response = on_update(domain_id, glossary, old_project_glossaries, "ENABLED")
+    response = on_update(domain_id, project_id, glossary, old_project_glossaries, "ENABLED")
   elif are_valid_parameters and request_type == "Delete":
     response = on_delete(domain_id, glossary)
   else:
@@ -57,19 +57,11 @@ MEMBER_STACK_SET_NAME = os.environ["MEMBER_STACK_SET_NAME"]
 GOV_STACK_NAME = os.environ["GOV_STACK_NAME"]
 NOTIFICATION_QUEUE_URL = os.environ["NOTIFICATION_QUEUE_URL"]
 
-# Set logger, tracer, and session
+# Set logger and tracer
 log_level = os.environ.get("LOG_LEVEL", "INFO")
 tracer_disabled = os.environ.get("TRACER_DISABLED", False)
 logger = utils.get_logger(log_level=log_level, service_name="member_account_boostrap_manager")
 tracer = utils.get_tracer(tracer_disabled=tracer_disabled, service_name="member_account_boostrap_manager")
-session = utils.get_session()
-
-# Initiate clients
-ram_client = session.client("ram")
-cfn_client = session.client("cloudformation")
-ssm_client = session.client("ssm")
-s3_client = session.client("s3")
-sqs_client = session.client("sqs")
 
 
 @dataclass
@@ -165,7 +157,7 @@ def create_stack_instance(parameters, principals):
 
   for this_try in range(0, max_retries):
     try:
-      response = cfn_client.create_stack_instances(
+      response = utils.get_client("cloudformation").create_stack_instances(
         StackSetName=MEMBER_STACK_SET_NAME,
         ParameterOverrides=parameters,
         DeploymentTargets={
@@ -213,13 +205,7 @@ def if_stack_exist(stack_name):
   """
   Check if a stack exists.
   """
-  stacks = cfn_client.list_stacks()["StackSummaries"]
-  for stack in stacks:
-    if stack["StackStatus"] == 'DELETE_COMPLETE':
-      continue
-    if stack_name == stack["StackName"]:
-      return True
-  return False
+  return utils.stack_exists(stack_name)
 
 
 def manage_cfn_stack(stack_name, template_file_name, parameters):
@@ -227,6 +213,7 @@ def manage_cfn_stack(stack_name, template_file_name, parameters):
   Manage CloudFormation stack.
   """
   cfn_response = {}
+  cfn_client = utils.get_client("cloudformation")
   try:
     if if_stack_exist(stack_name):
       logger.info(f"Updating {stack_name}")
@@ -267,9 +254,7 @@ def get_application_domain_id():
   Get the application domain ID.
   """
   try:
-    domain_id = ssm_client.get_parameter(
-      Name=DOMAIN_ID_PARAMETER_NAME,
-    )["Parameter"]["Value"]
+    domain_id = utils.get_parameter(DOMAIN_ID_PARAMETER_NAME)
   except ClientError as err:
     logger.error(f"Exception {err}")
     raise err
@@ -289,7 +274,7 @@ def get_request_domain_id_and_resource_share_name(request_type, event):
   elif request_type == "AssociateResourceShare":
     resource_share_arn = event["detail"]["requestParameters"]["resourceShareArn"]
     try:
-      response = ram_client.get_resource_shares(
+      response = utils.get_client("ram").get_resource_shares(
         resourceShareArns=[
           resource_share_arn,
         ],
@@ -316,7 +301,7 @@ def get_resource_arn(request_type, resource_share_arn, event):
     resource_arn = event["detail"]["requestParameters"]["resourceArns"][0]
   elif request_type == "AssociateResourceShare":
     try:
-      resource_arn = ram_client.list_resources(
+      resource_arn = utils.get_client("ram").list_resources(
         resourceOwner="SELF",
         resourceShareArns=[resource_share_arn],
       )["resources"][0]["arn"]
@@ -335,7 +320,7 @@ def get_resource_share_arn(domain_id, account_id):
   Get the resource share ARN for the domain.
   """
   try:
-    resource_share_arn = ram_client.get_resource_share_associations(
+    resource_share_arn = utils.get_client("ram").get_resource_share_associations(
       associationType="RESOURCE",
       resourceArn=f"arn:aws:datazone:{CURRENT_REGION}:{account_id}:domain/{domain_id}",
       associationStatus="ASSOCIATED"
@@ -352,7 +337,7 @@ def get_resource_share_principals(resource_share_arn):
   Get the resource share principals.
   """
   try:
-    resource_share_response = ram_client.get_resource_share_associations(
+    resource_share_response = utils.get_client("ram").get_resource_share_associations(
       associationType="PRINCIPAL",
       resourceShareArns=[resource_share_arn]
     )
@@ -391,7 +376,7 @@ def update_notification_queue_access_policy(principals, notification_queue_arn):
   queue_policy["Statement"] = policy_list
 
   try:
-    sqs_response = sqs_client.set_queue_attributes(
+    sqs_response = utils.get_client("sqs").set_queue_attributes(
       QueueUrl=NOTIFICATION_QUEUE_URL,
       Attributes={
         'Policy': json.dumps(queue_policy)
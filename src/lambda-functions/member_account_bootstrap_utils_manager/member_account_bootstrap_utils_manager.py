@@ -47,16 +47,11 @@ CFN_ASSETS_URL_PREFIX = os.environ["CFN_ASSETS_URL_PREFIX"]
 STACK_SET_ADMIN_ROLE_TEMPLATE_NAME = os.environ["STACK_SET_ADMIN_ROLE_TEMPLATE_NAME"]
 GOV_STACK_NAME = os.environ["GOV_STACK_NAME"]
 
-# Set logger, tracer, and session
+# Set logger and tracer
 log_level = os.environ.get("LOG_LEVEL", "INFO")
 tracer_disabled = os.environ.get("TRACER_DISABLED", False)
 logger = utils.get_logger(log_level=log_level, service_name="member_account_bootstrap_utils_manager")
 tracer = utils.get_tracer(tracer_disabled=tracer_disabled, service_name="member_account_bootstrap_utils_manager")
-session = utils.get_session()
-
-
-# Initiate clients
-cfn_client = session.client("cloudformation")
 
 
 def on_create(dz_member_stackset_stack_name, parameters):
@@ -82,13 +77,7 @@ def if_stack_exist(stack_name):
   """
   Check if a stack exists.
   """
-  stacks = cfn_client.list_stacks()["StackSummaries"]
-  for stack in stacks:
-    if stack["StackStatus"] == 'DELETE_COMPLETE':
-      continue
-    if stack_name == stack["StackName"]:
-      return True
-  return False
+  return utils.stack_exists(stack_name)
 
 
 def manage_cfn_stack(stack_name, parameters):
@@ -96,6 +85,7 @@ def manage_cfn_stack(stack_name, parameters):
   Manage the CloudFormation stack.
   """
   cfn_response = {}
+  cfn_client = utils.get_client("cloudformation")
   try:
     if if_stack_exist(stack_name):
       logger.info(f"stack {stack_name} exists....do nothing...")
@@ -130,7 +120,7 @@ def delete_cfn_stack(stack_name):
   Delete the CloudFormation stack.
   """
   try:
-    response = cfn_client.delete_stack(StackName=stack_name)
+    response = utils.get_client("cloudformation").delete_stack(StackName=stack_name)
     logger.info(f"Deleting {stack_name}")
   except ClientError as err:
     logger.error(f"Exception {err}")
@@ -20,6 +20,9 @@ This Lambda function manages the metadata form for a data solution.
 Environment Variables:
     LOG_LEVEL (str): The log level for the function (e.g., "INFO", "DEBUG", "WARNING").
     TRACER_DISABLED (bool): Whether to disable the AWS X-Ray tracer.
+    METADATA_FORM_MAX_WORKERS (int, optional): The number of concurrent metadata form operations. Defaults to 8.
+    DATAZONE_REQUESTS_PER_SECOND (float, optional): The client-side limit of DataZone calls per second.
+        Defaults to 10.
 
 Functions:
     lambda_handler(event, context): The entry point for the Lambda function.
@@ -31,24 +34,48 @@ Classes:
             metadataFormDescription (str): The description of the metadata form.
             metadataFormModelSmithy (str): The model smithy for the metadata form.
             metadataFormModelStatus (str): The status of the metadata form model.
+    SmithyModelParser: A parser checking the Smithy syntax of metadata form models.
 """
 
 
 import os
+import re
+import json
+import hashlib
+from functools import partial
 from dataclasses import dataclass
 from common import utils
 from botocore.exceptions import ClientError
 
-# Set logger, tracer, and session
+
+METADATA_FORM_MAX_WORKERS = int(os.environ.get("METADATA_FORM_MAX_WORKERS", 8))
+
+SMITHY_SIMPLE_TYPES = {"String", "Boolean", "Integer", "Long", "Short", "Byte", "Float", "Double", "BigInteger",
+                       "BigDecimal", "Timestamp", "Blob", "Document"}
+# Shape types declaring a simple shape, such as "string Name"
+SMITHY_SIMPLE_SHAPE_TYPES = {type_name[0].lower() + type_name[1:] for type_name in SMITHY_SIMPLE_TYPES}
+# Shape types whose body is a list of members, enum members may have no target
+SMITHY_AGGREGATE_SHAPE_TYPES = {"structure", "union", "list", "set", "map", "enum", "intEnum"}
+# Prelude traits checked by the validator, with the trait value they expect: None for no value,
+# str for a string, dict for key-value pairs. Other traits are accepted with a warning.
+SMITHY_PRELUDE_TRAITS = {"required": None, "documentation": str, "length": dict, "range": dict, "pattern": str}
+SMITHY_TOKEN_PATTERN = re.compile(r"""
+    (?P<space>[\s,]+|//[^\n]*)
+  | (?P<text>"{3}(?:[^\\]|\\.)*?"{3})
+  | (?P<string>"(?:[^"\\]|\\.)*")
+  | (?P<number>-?\d+(?:\.\d+)?)
+  | (?P<identifier>[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)*(?:\#[A-Za-z_][A-Za-z0-9_]*)?)
+  | (?P<symbol>[@$:={}()\[\]])
+""", re.VERBOSE)
+
+# Set logger and tracer
 log_level = os.environ.get("LOG_LEVEL", "INFO")
 tracer_disabled = os.environ.get("TRACER_DISABLED", False)
 logger = utils.get_logger(log_level=log_level, service_name="metadata_form_manager")
 tracer = utils.get_tracer(tracer_disabled=tracer_disabled, service_name="metadata_form_manager")
-session = utils.get_session()
 
-#  Initiate clients
-dz_client = session.client("datazone")
-ssm_client = session.client("ssm")
+# Parsed Smithy models keyed by the hash of their source, kept across warm invocations
+smithy_model_cache = utils.LruCache(max_size=256, ttl=86400)
 
 
 @dataclass
@@ -67,31 +94,285 @@ class MetadataForm:
   metadataFormModelSmithy: str
   metadataFormModelStatus: str
 
+  def content_hash(self):
+    """
+    Return a stable hash of the name, description, Smithy model and status of the metadata form
+    """
+    content = json.dumps([self.metadataFormName, self.metadataFormDescription, self.metadataFormModelSmithy,
+                          self.metadataFormModelStatus], separators=(",", ":"))
+
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:32]
+
+
+class SmithyModelParser:
+  """
+  A class parsing the Smithy IDL of metadata form models.
+
+  parse() returns the structures of the model as {structure name: {"traits": {...},
+  "members": {member name: {"target": str, "traits": {...}}}}} and raises ValueError with the
+  line and column of the first syntax error: unbalanced braces, a model without structure or a
+  malformed member. Shape types, traits and trait values the parser does not check, and targets
+  that are not defined in the model, are logged as warnings and left to DataZone.
+  """
+
+  def __init__(self, source):
+    self.source = source
+    self.tokens = []
+    self.position = 0
+    offset = 0
+    while match := SMITHY_TOKEN_PATTERN.match(source, offset):
+      if match.lastgroup != "space":
+        self.tokens.append((match.lastgroup, match.group(), offset))
+      offset = match.end()
+    if offset != len(source):
+      self._fail(f"unexpected character {source[offset]!r}", offset)
+
+  def _location(self, offset):
+    line = self.source.count("\n", 0, offset) + 1
+    column = offset - self.source.rfind("\n", 0, offset)
+    return f"line {line}, column {column}"
+
+  def _fail(self, message, offset=None):
+    if offset is None:
+      offset = self._peek()[2]
+    raise ValueError(f"{self._location(offset)}: {message}")
+
+  def _warn(self, message, offset):
+    logger.warning(f"Smithy model {self._location(offset)}: {message}")
+
+  def _peek(self):
+    return self.tokens[self.position] if self.position < len(self.tokens) else (None, None, len(self.source))
+
+  def _next(self, kind=None, value=None):
+    token_kind, token_value, _ = self._peek()
+    if token_kind is None or (kind and token_kind != kind) or (value and token_value != value):
+      self._fail(f"expected {value or kind}, found {token_value or 'end of model'}")
+    self.position += 1
+
+    return token_value
+
+  def _value(self):
+    token_kind, token_value, _ = self._peek()
+    if token_kind == "string":
+      self.position += 1
+      return json.loads(token_value)
+    if token_kind == "text":
+      self.position += 1
+      return token_value[3:-3]
+    if token_kind == "number":
+      self.position += 1
+      return float(token_value) if "." in token_value else int(token_value)
+    if token_kind == "identifier":
+      self.position += 1
+      return json.loads(token_value) if token_value in ("true", "false", "null") else token_value
+    if token_value == "[":
+      self.position += 1
+      values = []
+      while self._peek()[1] != "]":
+        values.append(self._value())
+      self._next(value="]")
+      return values
+    if token_value == "{":
+      self.position += 1
+      values = {}
+      while self._peek()[1] != "}":
+        key = self._next("identifier") if self._peek()[0] == "identifier" else json.loads(self._next("string"))
+        self._next(value=":")
+        values[key] = self._value()
+      self._next(value="}")
+      return values
+    self._fail(f"expected a value, found {token_value or 'end of model'}")
+
+  def _traits(self):
+    traits = {}
+    while self._peek()[1] == "@":
+      self.position += 1
+      _, _, offset = self._peek()
+      name = self._next("identifier")
+      value = None
+      if self._peek()[1] == "(":
+        self.position += 1
+        if self._peek()[0] == "identifier" and self.position + 1 < len(self.tokens) \
+            and self.tokens[self.position + 1][1] == ":":
+          value = {}
+          while self._peek()[1] != ")":
+            key = self._next("identifier")
+            self._next(value=":")
+            value[key] = self._value()
+        elif self._peek()[1] != ")":
+          value = self._value()
+        self._next(value=")")
+      self._check_trait(name, value, offset)
+      if name in traits:
+        self._fail(f"duplicate trait @{name}", offset)
+      traits[name] = value
+
+    return traits
+
+  def _check_trait(self, name, value, offset):
+    if name.startswith("amazon.datazone#"):
+      if name == "amazon.datazone#displayname" and not isinstance((value or {}).get("defaultName"), str):
+        self._warn("@amazon.datazone#displayname has no defaultName string", offset)
+      return
+    name = name.removeprefix("smithy.api#")
+    if name not in SMITHY_PRELUDE_TRAITS:
+      self._warn(f"trait @{name} is not checked", offset)
+      return
+    expected_type = SMITHY_PRELUDE_TRAITS[name]
+    if (expected_type is None and value is not None) or (expected_type and not isinstance(value, expected_type)):
+      self._warn(f"@{name} expects {'no value' if expected_type is None else expected_type.__name__ + ' value'}", offset)
+
+  def _skip_block(self):
+    _, _, offset = self._peek()
+    self._next(value="{")
+    depth = 1
+    while depth:
+      token_value = self._peek()[1]
+      if token_value is None:
+        self._fail("unbalanced braces", offset)
+      depth += {"{": 1, "}": -1}.get(token_value, 0)
+      self.position += 1
+
+  def _members(self, shape_name, shape_type, targets):
+    members = {}
+    self._next(value="{")
+    while self._peek()[1] != "}":
+      member_traits = self._traits()
+      _, _, offset = self._peek()
+      member_name = self._next("identifier")
+      if member_name in members:
+        self._fail(f"duplicate member {member_name} in {shape_name}", offset)
+      members[member_name] = {"target": None, "traits": member_traits}
+      if self._peek()[1] == ":":
+        self.position += 1
+        _, _, target_offset = self._peek()
+        members[member_name]["target"] = self._next("identifier")
+        targets.append((members[member_name]["target"], target_offset))
+      elif shape_type not in ("enum", "intEnum"):
+        self._fail(f"expected : after member {member_name} of {shape_name}")
+      if self._peek()[1] == "=":
+        self.position += 1
+        members[member_name]["default"] = self._value()
+    self._next(value="}")
+
+    return members
+
+  def parse(self):
+    """
+    Parse the model and return its structures
+    """
+    structures = {}
+    shape_names = set()
+    targets = []
+    while self._peek()[0] is not None:
+      if self._peek()[1] == "$":
+        self.position += 1
+        self._next("identifier")
+        self._next(value=":")
+        self._value()
+        continue
+      if self._peek()[1] in ("namespace", "use"):
+        self.position += 1
+        self._next("identifier")
+        continue
+      if self._peek()[1] == "apply":
+        self.position += 1
+        self._next("identifier")
+        self._traits()
+        continue
+
+      traits = self._traits()
+      _, _, offset = self._peek()
+      shape_type = self._next("identifier")
+      _, _, name_offset = self._peek()
+      shape_name = self._next("identifier")
+      if shape_name in shape_names:
+        self._fail(f"duplicate shape {shape_name}", name_offset)
+      shape_names.add(shape_name)
+      if self._peek()[1] == "with":
+        self.position += 1
+        self._value()
+      if shape_type in SMITHY_SIMPLE_SHAPE_TYPES:
+        continue
+      if shape_type not in SMITHY_AGGREGATE_SHAPE_TYPES:
+        self._warn(f"shape type {shape_type} is not checked", offset)
+        if self._peek()[1] == "{":
+          self._skip_block()
+        continue
+
+      members = self._members(shape_name, shape_type, targets)
+      if shape_type == "structure":
+        structures[shape_name] = {"traits": traits, "members": members}
+
+    if not structures:
+      self._fail("expected at least one structure")
+    for target, offset in targets:
+      if target.removeprefix("smithy.api#") not in SMITHY_SIMPLE_TYPES and target not in shape_names:
+        self._warn(f"target shape {target} is not defined in the model", offset)
+
+    return structures
+
+
+def parse_smithy_model(smithy_model):
+  """
+  Parse a Smithy model, reusing the cached result for a model already parsed
+  """
+  model_hash = hashlib.sha256(smithy_model.encode("utf-8")).hexdigest()
+  structures = smithy_model_cache.get(model_hash)
+  if structures is None:
+    structures = SmithyModelParser(smithy_model).parse()
+    smithy_model_cache.put(model_hash, structures)
+
+  return structures
+
 
-def on_create(domain_id, project_id, project_metadata_forms):
+def validate_project_metadata_forms(project_metadata_forms):
+  """
+  Validate the Smithy model of every metadata form before any DataZone call, raising one
+  ValueError listing every invalid form
+  """
+  problems = []
+  for form in project_metadata_forms:
+    form_name = form.get("FormName")
+    try:
+      structures = parse_smithy_model(form["FormSmithyModel"])
+    except (KeyError, TypeError, ValueError) as err:
+      problems.append(f"{form_name}: {err}")
+      continue
+    if form_name not in structures:
+      problems.append(f"{form_name}: the model must define a structure named {form_name}")
+
+  if problems:
+    message = f"Invalid metadata form Smithy models: {'; '.join(problems)}"
+    logger.error(message)
+    raise ValueError(message)
+
+
+def on_create(domain_id, project_id, project_metadata_forms, hash_parameter_name):
   """
   Initiate creation of glossary for the data solution.
   """
-  response = create_and_update_project_metadata_forms(domain_id, project_id, project_metadata_forms, "ENABLED")
+  response = create_and_update_project_metadata_forms(domain_id, project_id, project_metadata_forms, "ENABLED",
+                                                      hash_parameter_name)
 
   return response
 
 
-def on_update(domain_id, project_id, project_metadata_forms):
+def on_update(domain_id, project_id, project_metadata_forms, hash_parameter_name):
   """
   Initiate update of glossary for the data solution.
   """
-  response = create_and_update_project_metadata_forms(domain_id, project_id, project_metadata_forms, "ENABLED")
+  response = create_and_update_project_metadata_forms(domain_id, project_id, project_metadata_forms, "ENABLED",
+                                                      hash_parameter_name)
 
   return response
 
 
-def on_delete(domain_id, project_id, project_metadata_forms):
+def on_delete(domain_id, project_id, project_metadata_forms, hash_parameter_name):
   """
   Initiate deletion of glossary for the data solution.
   """
-  update_response = create_and_update_project_metadata_forms(domain_id, project_id, project_metadata_forms, "DISABLED")
-  response = delete_project_metadata_forms(domain_id, project_metadata_forms)
+  response = delete_project_metadata_forms(domain_id, project_id, project_metadata_forms, hash_parameter_name)
 
   return response
 
@@ -100,8 +381,9 @@ def create_and_update_metadata_form(domain_id, project_id, metadata_form):
   """
   Create and update a metadata form.
   """
+  utils.datazone_rate_limiter.acquire()
   try:
-    response = dz_client.create_form_type(
+    response = utils.get_client("datazone").create_form_type(
       description=metadata_form.metadataFormDescription,
       domainIdentifier=domain_id,
       model={
@@ -119,41 +401,122 @@ def create_and_update_metadata_form(domain_id, project_id, metadata_form):
   return response
 
 
-def create_and_update_project_metadata_forms(domain_id, project_id, project_metadata_forms, status):
+def create_and_update_project_metadata_forms(domain_id, project_id, project_metadata_forms, status,
+                                            hash_parameter_name=None):
   """
-  Create and update metadata forms for a project.
+  Create and update metadata forms for a project concurrently.
+
+  Forms whose content hash matches the one stored in hash_parameter_name are skipped, so only
+  changed forms get a new revision. The hashes of the forms created are stored even when other
+  forms fail.
   """
+  stored_hashes = get_metadata_form_hashes(hash_parameter_name)
+  form_names = {form["FormName"] for form in project_metadata_forms}
+  form_hashes = {form_name: form_hash for form_name, form_hash in stored_hashes.items() if form_name in form_names}
+
+  changed_metadata_forms = []
+  skipped_form_names = []
   for form in project_metadata_forms:
-    form_name = form["FormName"]
-    form_description = form["FormDescription"]
-    form_smithy_model = form["FormSmithyModel"]
+    metadata_form = MetadataForm(metadataFormName=form["FormName"], metadataFormDescription=form["FormDescription"],
+                                 metadataFormModelSmithy=form["FormSmithyModel"], metadataFormModelStatus=status)
+    if form_hashes.get(metadata_form.metadataFormName) == metadata_form.content_hash():
+      skipped_form_names.append(metadata_form.metadataFormName)
+    else:
+      changed_metadata_forms.append(metadata_form)
+
+  results = utils.run_concurrently(
+    create_and_update_metadata_form,
+    [(domain_id, project_id, metadata_form) for metadata_form in changed_metadata_forms],
+    METADATA_FORM_MAX_WORKERS, return_exceptions=True)
+  for metadata_form, result in zip(changed_metadata_forms, results):
+    if not isinstance(result, Exception):
+      form_hashes[metadata_form.metadataFormName] = metadata_form.content_hash()
+
+  if hash_parameter_name and form_hashes != stored_hashes:
+    put_ssm_parameter(hash_parameter_name, json.dumps(form_hashes, sort_keys=True))
+
+  return summarize_metadata_form_results(
+    "create or update", [metadata_form.metadataFormName for metadata_form in changed_metadata_forms], results,
+    skipped_form_names)
+
+
+def summarize_metadata_form_results(operation, form_names, results, skipped_form_names):
+  """
+  Aggregate the outcome of metadata form operations into one result, raising it when any failed.
 
-    metadata_form = MetadataForm(metadataFormName=form_name, metadataFormDescription=form_description,
-                                 metadataFormModelSmithy=form_smithy_model, metadataFormModelStatus=status)
+  results holds the response of each operation, or the exception it raised.
+  """
+  errors = [result if isinstance(result, Exception) else None for result in results]
+  result = {
+    "operation": operation,
+    "succeeded": [form_name for form_name, error in zip(form_names, errors) if not error],
+    "skipped": skipped_form_names,
+    "failed": [{
+      "formName": form_name,
+      "errorCode": error.response["Error"]["Code"] if isinstance(error, ClientError) else type(error).__name__,
+      "message": str(error)
+    } for form_name, error in zip(form_names, errors) if error]
+  }
+  if result["failed"]:
+    message = f"{len(result['failed'])} of {len(form_names)} metadata forms failed to {operation}: {json.dumps(result)}"
+    logger.error(message)
+    raise RuntimeError(message)
 
-    metadata_form_create_response = create_and_update_metadata_form(domain_id, project_id, metadata_form)
+  logger.info(f"Metadata forms {operation} result: {json.dumps(result)}")
 
-  return {'statusCode': 200, 'body': "All metadata forms successfully created or updated!"}
+  return {'statusCode': 200, 'body': json.dumps(result)}
 
 
-def delete_project_metadata_forms(domain_id, project_metadata_forms):
+def get_metadata_form_hashes(hash_parameter_name):
   """
-  Delete metadata forms for a project.
+  Get the stored content hashes of the metadata forms, keyed by form name
   """
-  for form in project_metadata_forms:
-    form_name = form["FormName"]
+  if not hash_parameter_name:
+    return {}
+
+  try:
+    value = utils.get_parameters([hash_parameter_name], force_fetch=True).get(hash_parameter_name)
+  except ClientError as err:
+    logger.error(f"Exception {err}")
+    raise err
+
+  return json.loads(value) if value else {}
 
-    metadata_form_delete_response = delete_metadata_form(domain_id, form_name)
 
-  return {'statusCode': 200, 'body': "All metadata forms successfully deleted!"}
+def delete_project_metadata_forms(domain_id, project_id, project_metadata_forms, hash_parameter_name=None):
+  """
+  Delete metadata forms for a project concurrently.
+  """
+  metadata_forms = [MetadataForm(metadataFormName=form["FormName"], metadataFormDescription=form["FormDescription"],
+                                 metadataFormModelSmithy=form["FormSmithyModel"], metadataFormModelStatus="DISABLED")
+                    for form in project_metadata_forms]
+  results = utils.run_concurrently(
+    teardown_metadata_form, [(domain_id, project_id, metadata_form) for metadata_form in metadata_forms],
+    METADATA_FORM_MAX_WORKERS, return_exceptions=True)
+
+  if hash_parameter_name and not any(isinstance(result, Exception) for result in results):
+    delete_ssm_parameter(hash_parameter_name)
+
+  return summarize_metadata_form_results(
+    "delete", [metadata_form.metadataFormName for metadata_form in metadata_forms], results, [])
+
+
+def teardown_metadata_form(domain_id, project_id, metadata_form):
+  """
+  Delete a metadata form, disabling it first when DataZone refuses to delete it while enabled
+  """
+  return utils.delete_with_disable_fallback(
+    partial(delete_metadata_form, domain_id, metadata_form.metadataFormName),
+    partial(create_and_update_metadata_form, domain_id, project_id, metadata_form))
 
 
 def delete_metadata_form(domain_id, metadata_form_name):
   """
   Delete a metadata form.
   """
+  utils.datazone_rate_limiter.acquire()
   try:
-    response = dz_client.delete_form_type(
+    response = utils.get_client("datazone").delete_form_type(
       domainIdentifier=domain_id,
       formTypeIdentifier=metadata_form_name
     )
@@ -165,6 +528,46 @@ def delete_metadata_form(domain_id, metadata_form_name):
   return response
 
 
+def put_ssm_parameter(parameter_name, parameter_value):
+  """
+  Put SSM parameter
+  """
+  try:
+    response = utils.get_client("ssm").put_parameter(
+      Name=parameter_name,
+      Value=parameter_value,
+      Type='String',
+      Tier='Intelligent-Tiering',
+      Overwrite=True
+    )
+    utils.invalidate_parameters(parameter_name)
+    logger.info(f"SSM parameter {parameter_name} created or updated!")
+  except ClientError as err:
+    logger.error(f"Exception {err}")
+    raise err
+
+  return response
+
+
+def delete_ssm_parameter(parameter_name):
+  """
+  Delete SSM parameter
+  """
+  try:
+    response = utils.get_client("ssm").delete_parameter(
+      Name=parameter_name
+    )
+    utils.invalidate_parameters(parameter_name)
+    logger.info(f"SSM parameter {parameter_name} deleted!")
+  except ClientError as err:
+    if err.response["Error"]["Code"] == "ParameterNotFound":
+      return None
+    logger.error(f"Exception {err}")
+    raise err
+
+  return response
+
+
 @tracer.capture_lambda_handler
 def lambda_handler(event, context):
   """
@@ -185,6 +588,7 @@ def lambda_handler(event, context):
   project_name = event["ResourceProperties"]["ProjectName"]
   metadata_form_project_name = event["ResourceProperties"]["MetadataFormProjectName"]
   project_metadata_forms = event["ResourceProperties"]["ProjectMetadataForms"]
+  hash_parameter_name = event["ResourceProperties"].get("MetadataFormHashParameterName")
 
   are_valid_parameters = utils.check_input_parameters(request_type, domain_id, project_id, project_metadata_forms)
 
@@ -194,12 +598,15 @@ def lambda_handler(event, context):
     raise ValueError(message)
 
 
+  if are_valid_parameters and request_type in ("Create", "Update"):
+    validate_project_metadata_forms(project_metadata_forms)
+
   if are_valid_parameters and request_type == "Create":
-    response = on_create(domain_id, project_id, project_metadata_forms)
+    response = on_create(domain_id, project_id, project_metadata_forms, hash_parameter_name)
   elif are_valid_parameters and request_type == "Update":
-    response = on_update(domain_id, project_id, project_metadata_forms)
+    response = on_update(domain_id, project_id, project_metadata_forms, hash_parameter_name)
   elif are_valid_parameters and request_type == "Delete":
-    response = on_delete(domain_id, project_id, project_metadata_forms)
+    response = on_delete(domain_id, project_id, project_metadata_forms, hash_parameter_name)
   else:
     logger.error(f"Unsupported request type: {request_type}")
     raise ValueError(f"Unsupported request type: {request_type}")
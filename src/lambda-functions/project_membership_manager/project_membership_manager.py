@@ -17,9 +17,26 @@ SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
 This Lambda function manages the project membership for a data solution.
 
+A custom resource either manages one membership, with the ProjectId, ProjectName, UserIdentifier
+and Designation properties, or a batch of memberships, with the Projects list of {ProjectId,
+ProjectName} and the Users list of {UserIdentifier, Designation}: every user becomes a member
+of every project, or the rosters of projects, with the Rosters list of {ProjectId, ProjectName,
+Members: [{UserIdentifier, Designation}]}. A roster is synced against the live project memberships:
+missing members are added, drifted designations are changed and members dropped from the roster
+are removed. With the RosterPrune property set to "true", every user member missing from the
+roster is removed, including those added outside of it. Group members are always left in place.
+
 Environment Variables:
     LOG_LEVEL (str): The log level for the function (e.g., "INFO", "DEBUG", "WARNING").
     TRACER_DISABLED (bool): Whether to disable the AWS X-Ray tracer.
+    MEMBERSHIP_MAX_WORKERS (int, optional): The number of concurrent membership operations of a batch.
+        Defaults to 8.
+    DATAZONE_REQUESTS_PER_SECOND (float, optional): The client-side limit of DataZone calls per second.
+        Defaults to 10.
+    USER_PROFILE_CACHE_MAX_SIZE (int, optional): The maximum number of cached user profile ids. Defaults to 4096.
+    USER_PROFILE_CACHE_TTL_SECONDS (int, optional): The lifetime of a cached user profile id. Defaults to 3600.
+    USER_PROFILE_PRELOAD_THRESHOLD (int, optional): The number of uncached users of a request from which all
+        IAM user profiles of the domain are loaded with one paginated search. Defaults to 20, 0 disables it.
 
 Functions:
     lambda_handler(event, context): The entry point for the Lambda function.
@@ -32,23 +49,36 @@ Classes:
     Project: A dataclass representing a project within a data solution.
         Attributes:
             name (str): The name of the project.
+
+    Membership: A dataclass representing the membership of a user in a project.
+    MembershipUpdatePlan: A dataclass representing the membership changes of an update.
+    ProjectRoster: A dataclass representing the desired user members of a project.
 """
 
 import os
+import json
 from uuid import uuid4
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from common import utils
 from botocore.exceptions import ClientError
 
-# Set logger, tracer, and session
+
+MEMBERSHIP_MAX_WORKERS = int(os.environ.get("MEMBERSHIP_MAX_WORKERS", 8))
+USER_PROFILE_CACHE_MAX_SIZE = int(os.environ.get("USER_PROFILE_CACHE_MAX_SIZE", 4096))
+USER_PROFILE_CACHE_TTL_SECONDS = int(os.environ.get("USER_PROFILE_CACHE_TTL_SECONDS", 3600))
+USER_PROFILE_PRELOAD_THRESHOLD = int(os.environ.get("USER_PROFILE_PRELOAD_THRESHOLD", 20))
+LIST_MEMBERSHIPS_MAX_RESULTS = 50
+SEARCH_USER_PROFILES_MAX_RESULTS = 50
+
+# Set logger and tracer
 log_level = os.environ.get("LOG_LEVEL", "INFO")
 tracer_disabled = os.environ.get("TRACER_DISABLED", False)
 logger = utils.get_logger(log_level=log_level, service_name="project_membership_manager")
 tracer = utils.get_tracer(tracer_disabled=tracer_disabled, service_name="project_membership_manager")
-session = utils.get_session()
 
-# Initiate clients
-dz_client = session.client("datazone")
+
+# User profile ids keyed by (domain id, user identifier), kept across warm invocations
+user_profile_cache = utils.LruCache(max_size=USER_PROFILE_CACHE_MAX_SIZE, ttl=USER_PROFILE_CACHE_TTL_SECONDS)
 
 
 @dataclass
@@ -97,11 +127,56 @@ class User:
   designation: str
 
 
+@dataclass
+class Membership:
+  """
+  A class representing the membership of a user in a project.
+
+  Attributes:
+      project (Project): The project.
+      user (User): The member, with their designation in the project.
+
+  Methods:
+      None
+  """
+  project: Project
+  user: User
+
+
+@dataclass
+class MembershipUpdatePlan:
+  """
+  A class representing the minimal set of changes turning old memberships into new ones, matched by
+  project id and user identifier.
+
+  Attributes:
+      createMemberships (list): Memberships added to the projects.
+      deleteMemberships (list): Memberships removed from the projects.
+      changeMemberships (list): Memberships whose designation changed.
+  """
+  createMemberships: list = field(default_factory=list)
+  deleteMemberships: list = field(default_factory=list)
+  changeMemberships: list = field(default_factory=list)
+
+
+@dataclass
+class ProjectRoster:
+  """
+  A class representing the desired user members of a project.
+
+  Attributes:
+      project (Project): The project.
+      users (list): The users of the project, with their designations.
+  """
+  project: Project
+  users: list
+
+
 def on_create(domain, project, user):
   """
   Initiate creation of project membership for the data solution.
   """
-  user_profile_id = dz_create_user_profile(domain.id, user.id)
+  user_profile_id = resolve_user_profile_id(domain.id, user.id, create=True)
   response = dz_create_project_membership(domain, project, user, user_profile_id)
 
   return response
@@ -111,31 +186,372 @@ def on_delete(domain, project, user):
   """
   Initiate deletion of project membership for the data solution.
   """
-  user_profile_id = dz_get_user_profile_id(domain.id, user.id)
-  response = dz_delete_project_membership(domain, project, user_profile_id)
+  try:
+    user_profile_id = resolve_user_profile_id(domain.id, user.id, create=False)
+  except ClientError as err:
+    if err.response["Error"]["Code"] != "ResourceNotFoundException":
+      raise err
+    logger.info(f"User profile of {user.id} not found, no membership to delete")
+    return None
+  response = teardown_project_membership(domain, project, user_profile_id)
 
   return response
 
 
-def on_update(domain, project, user):
+def on_update(domain, old_project, old_user, project, user):
   """
   Initiate update of project membership for the data solution.
+
+  Nothing is called when neither the project, the user nor the designation changed, and only the
+  designation is changed when the project and the user are the same.
   """
-  user_profile_id = dz_get_user_profile_id(domain.id, user.id)
-  delete_response = dz_delete_project_membership(domain, project, user_profile_id)
+  if (old_project.id, old_user) == (project.id, user):
+    logger.info(f"Project {project.name} membership unchanged")
+    return {'statusCode': 200, 'body': "Project membership unchanged"}
+
+  if (old_project.id, old_user.id) == (project.id, user.id):
+    user_profile_id = resolve_user_profile_id(domain.id, user.id, create=False)
+    response = dz_change_project_membership_designation(domain, project, user, user_profile_id)
+
+    return response
+
+  old_user_profile_id = resolve_user_profile_id(domain.id, old_user.id, create=False)
+  delete_response = dz_delete_project_membership(domain, old_project, old_user_profile_id)
+
+  response = on_create(domain, project, user)
+
+  return response
+
+
+def on_create_batch(domain, memberships):
+  """
+  Initiate creation of a batch of project memberships for the data solution.
+  """
+  response = apply_memberships(domain, memberships, "create")
+
+  return response
 
-  response = dz_create_project_membership(domain, project, user, user_profile_id)
+
+def on_delete_batch(domain, memberships):
+  """
+  Initiate deletion of a batch of project memberships for the data solution.
+  """
+  response = apply_memberships(domain, memberships, "delete")
+
+  return response
+
+
+def on_update_batch(domain, old_memberships, memberships):
+  """
+  Initiate update of a batch of project memberships for the data solution.
+  """
+  plan = plan_membership_update(old_memberships, memberships)
+  response = apply_membership_operations(domain, [("delete", membership) for membership in plan.deleteMemberships] +
+                                         [("change", membership) for membership in plan.changeMemberships] +
+                                         [("create", membership) for membership in plan.createMemberships])
+
+  return response
+
+
+def plan_membership_update(old_memberships, memberships):
+  """
+  Diff old and new memberships by project id and user identifier into a MembershipUpdatePlan.
+  """
+  plan = MembershipUpdatePlan()
+  old_designations = {(membership.project.id, membership.user.id): membership.user.designation
+                      for membership in old_memberships}
+  membership_keys = {(membership.project.id, membership.user.id) for membership in memberships}
+
+  for membership in memberships:
+    old_designation = old_designations.get((membership.project.id, membership.user.id))
+    if old_designation is None:
+      plan.createMemberships.append(membership)
+    elif old_designation != membership.user.designation:
+      plan.changeMemberships.append(membership)
+
+  plan.deleteMemberships = [membership for membership in old_memberships
+                            if (membership.project.id, membership.user.id) not in membership_keys]
+
+  return plan
+
+
+def on_sync_rosters(domain, old_rosters, rosters, prune):
+  """
+  Initiate sync of project rosters for the data solution.
+  """
+  response = sync_project_rosters(domain, old_rosters, rosters, prune)
 
   return response
 
 
+def on_delete_rosters(domain, rosters):
+  """
+  Initiate deletion of the members of project rosters for the data solution.
+  """
+  response = apply_memberships(domain, get_roster_memberships(rosters), "delete")
+
+  return response
+
+
+def get_project_rosters(resource_properties):
+  """
+  Read the Rosters list of a roster custom resource
+  """
+  return [
+    ProjectRoster(project=Project(name=roster["ProjectName"], id=roster["ProjectId"]),
+                  users=[User(id=member["UserIdentifier"], designation=member["Designation"])
+                         for member in roster["Members"]])
+    for roster in resource_properties.get("Rosters", [])
+  ]
+
+
+def get_roster_memberships(rosters):
+  """
+  Flatten project rosters into memberships
+  """
+  return [Membership(project=roster.project, user=user) for roster in rosters for user in roster.users]
+
+
+def sync_project_rosters(domain, old_rosters, rosters, prune):
+  """
+  Reconcile the live memberships of the projects of old and new rosters with the new rosters.
+
+  The memberships of all projects are listed concurrently, the delta is computed in memory and
+  then applied concurrently under the DataZone rate limit.
+  """
+  memberships = get_roster_memberships(rosters)
+  user_profile_ids = resolve_user_profile_ids(domain, [membership.user.id for membership in memberships],
+                                              {membership.user.id for membership in memberships})
+
+  projects = list({roster.project.id: roster.project for roster in old_rosters + rosters}.values())
+  live_members = dict(zip([project.id for project in projects], utils.run_concurrently(
+    dz_list_project_members, [(domain, project) for project in projects], MEMBERSHIP_MAX_WORKERS)))
+
+  old_user_ids = {(membership.project.id, membership.user.id) for membership in get_roster_memberships(old_rosters)}
+  old_user_profile_ids = {}
+  if not prune:
+    old_user_profile_ids = resolve_user_profile_ids(
+      domain, [user_id for _, user_id in old_user_ids if user_id not in user_profile_ids], set())
+  old_user_profile_ids.update(user_profile_ids)
+
+  operations, operation_user_profile_ids = plan_roster_sync(projects, live_members, memberships, user_profile_ids,
+                                                            old_user_ids, old_user_profile_ids, prune)
+  logger.info(f"Roster sync of {len(projects)} projects: {len(operations)} membership operations")
+
+  return run_membership_operations(domain, operations, operation_user_profile_ids)
+
+
+def plan_roster_sync(projects, live_members, memberships, user_profile_ids, old_user_ids, old_user_profile_ids,
+                     prune):
+  """
+  Compare live project members, keyed by user profile id, with the roster memberships.
+
+  Returns the (operation, membership) pairs of the delta and the user profile id of each. Live user
+  members missing from the rosters are removed when they were in the old rosters, or when pruning.
+  Nothing is removed from a project with a roster user whose profile could not be resolved, as
+  that user's live membership cannot be told apart from the members to remove.
+  """
+  operations, operation_user_profile_ids = [], []
+  desired_members = set()
+  unresolved_project_ids = set()
+
+  for membership in memberships:
+    user_profile_id = user_profile_ids[membership.user.id]
+    if isinstance(user_profile_id, Exception):
+      unresolved_project_ids.add(membership.project.id)
+    else:
+      desired_members.add((membership.project.id, user_profile_id))
+    designation = None
+    if not isinstance(user_profile_id, Exception):
+      designation = live_members[membership.project.id].get(user_profile_id)
+    if designation is None:
+      operations.append(("create", membership))
+    elif designation != membership.user.designation:
+      operations.append(("change", membership))
+    else:
+      continue
+    operation_user_profile_ids.append(user_profile_id)
+
+  old_members = {}
+  for project_id, user_id in old_user_ids:
+    user_profile_id = old_user_profile_ids.get(user_id)
+    if isinstance(user_profile_id, str):
+      old_members[(project_id, user_profile_id)] = user_id
+
+  for project in projects:
+    if project.id in unresolved_project_ids:
+      logger.warning(f"Project {project.name} has roster users without a user profile id, no member is removed")
+      continue
+    for user_profile_id, designation in live_members[project.id].items():
+      if (project.id, user_profile_id) in desired_members:
+        continue
+      user_id = old_members.get((project.id, user_profile_id))
+      if user_id is None and not prune:
+        logger.warning(f"Project {project.name} member {user_profile_id} is not in the roster")
+        continue
+      operations.append(("delete", Membership(project=project,
+                                              user=User(id=user_id or user_profile_id, designation=designation))))
+      operation_user_profile_ids.append(user_profile_id)
+
+  return operations, operation_user_profile_ids
+
+
+def get_batch_memberships(resource_properties):
+  """
+  Expand the Projects and Users lists of a batch custom resource into memberships
+  """
+  projects = [Project(name=project["ProjectName"], id=project["ProjectId"])
+              for project in resource_properties["Projects"]]
+  users = [User(id=user["UserIdentifier"], designation=user["Designation"]) for user in resource_properties["Users"]]
+
+  return [Membership(project=project, user=user) for project in projects for user in users]
+
+
+def resolve_user_profile_ids(domain, user_ids, created_user_ids):
+  """
+  Create the user profile of each distinct user of created_user_ids and look up the others, once
+  per user, concurrently. Cached profiles need no call, and many uncached users are first looked
+  up with a single paginated search of the domain user profiles.
+
+  Returns the user profile id of each user, or the exception raised for it.
+  """
+  user_ids = list(dict.fromkeys(user_ids))
+  uncached_count = sum(user_profile_cache.get((domain.id, user_id)) is None for user_id in user_ids)
+  if USER_PROFILE_PRELOAD_THRESHOLD and uncached_count >= USER_PROFILE_PRELOAD_THRESHOLD:
+    preload_user_profile_ids(domain.id)
+
+  results = utils.run_concurrently(resolve_user_profile_id,
+                                   [(domain.id, user_id, user_id in created_user_ids) for user_id in user_ids],
+                                   MEMBERSHIP_MAX_WORKERS, return_exceptions=True)
+
+  return dict(zip(user_ids, results))
+
+
+def resolve_user_profile_id(domain_id, user_id, create):
+  """
+  Return the cached user profile id of a user, otherwise create the user profile, or look up
+  the existing one, and cache its id
+  """
+  user_profile_id = user_profile_cache.get((domain_id, user_id))
+  if user_profile_id:
+    return user_profile_id
+
+  if create:
+    user_profile_id = dz_create_user_profile(domain_id, user_id)
+  else:
+    user_profile_id = dz_get_user_profile_id(domain_id, user_id)
+  user_profile_cache.put((domain_id, user_id), user_profile_id)
+
+  return user_profile_id
+
+
+def preload_user_profile_ids(domain_id):
+  """
+  Cache the ids of all active IAM user profiles of a domain
+  """
+  user_profiles = dz_search_iam_user_profiles(domain_id)
+  for user_profile in user_profiles:
+    arn = user_profile.get("details", {}).get("iam", {}).get("arn")
+    if arn and user_profile.get("status") != "DEACTIVATED":
+      user_profile_cache.put((domain_id, arn), user_profile["id"])
+  logger.info(f"Loaded {len(user_profiles)} user profiles of domain {domain_id}")
+
+
+def apply_membership(domain, membership, user_profile_id, operation):
+  """
+  Create, delete or change the designation of one membership of a batch
+  """
+  if isinstance(user_profile_id, Exception):
+    if operation == "delete" and isinstance(user_profile_id, ClientError) \
+        and user_profile_id.response["Error"]["Code"] == "ResourceNotFoundException":
+      logger.info(f"User profile of {membership.user.id} not found, no membership to delete")
+      return None
+    raise user_profile_id
+  try:
+    if operation == "create":
+      return dz_create_project_membership(domain, membership.project, membership.user, user_profile_id)
+    if operation == "change":
+      return dz_change_project_membership_designation(domain, membership.project, membership.user, user_profile_id)
+
+    return teardown_project_membership(domain, membership.project, user_profile_id)
+  except ClientError as err:
+    # The cached profile id may be stale, it is looked up again by the next request
+    user_profile_cache.invalidate((domain.id, membership.user.id))
+    raise err
+
+
+def apply_memberships(domain, memberships, operation):
+  """
+  Create or delete memberships
+  """
+  return apply_membership_operations(domain, [(operation, membership) for membership in memberships])
+
+
+def apply_membership_operations(domain, operations):
+  """
+  Resolve the user profiles of (operation, membership) pairs and apply them
+  """
+  created_user_ids = {membership.user.id for operation, membership in operations if operation == "create"}
+  user_profile_ids = resolve_user_profile_ids(domain, [membership.user.id for _, membership in operations],
+                                              created_user_ids)
+
+  return run_membership_operations(domain, operations,
+                                   [user_profile_ids[membership.user.id] for _, membership in operations])
+
+
+def run_membership_operations(domain, operations, user_profile_ids):
+  """
+  Apply (operation, membership) pairs concurrently under the DataZone rate limit and report the
+  outcome of each one, raising the report when any failed
+  """
+  results = utils.run_concurrently(
+    apply_membership,
+    [(domain, membership, user_profile_id, operation)
+     for (operation, membership), user_profile_id in zip(operations, user_profile_ids)],
+    MEMBERSHIP_MAX_WORKERS, return_exceptions=True)
+
+  return report_memberships(operations, results)
+
+
+def report_memberships(operations, results):
+  """
+  Build the per membership report of a batch, raising it when any membership operation failed
+  """
+  items = []
+  for (operation, membership), result in zip(operations, results):
+    item = {
+      "operation": operation,
+      "projectName": membership.project.name,
+      "projectId": membership.project.id,
+      "userIdentifier": membership.user.id,
+      "designation": membership.user.designation,
+      "status": "FAILED" if isinstance(result, Exception) else "SUCCEEDED"
+    }
+    if isinstance(result, Exception):
+      item["errorCode"] = result.response["Error"]["Code"] if isinstance(result, ClientError) else type(result).__name__
+      item["message"] = str(result)
+    items.append(item)
+
+  failed_count = sum(item["status"] == "FAILED" for item in items)
+  report = {"succeeded": len(items) - failed_count, "failed": failed_count, "memberships": items}
+  if failed_count:
+    message = f"{failed_count} of {len(items)} project membership operations failed: {json.dumps(report)}"
+    logger.error(message)
+    raise RuntimeError(message)
+
+  logger.info(f"Project memberships report: {json.dumps(report)}")
+
+  return {'statusCode': 200, 'body': json.dumps(report)}
+
+
 def dz_create_project_membership(domain, project, user, user_profile_id):
   """
   Create project membership for the data solution.
   """
   response = {}
+  utils.datazone_rate_limiter.acquire()
   try:
-    response = dz_client.create_project_membership(
+    response = utils.get_client("datazone").create_project_membership(
       designation=user.designation,
       domainIdentifier=domain.id,
       member={
@@ -165,8 +581,9 @@ def dz_delete_project_membership(domain, project, user_profile_id):
   """
   Delete project membership for the data solution.
   """
+  utils.datazone_rate_limiter.acquire()
   try:
-    response = dz_client.delete_project_membership(
+    response = utils.get_client("datazone").delete_project_membership(
       domainIdentifier=domain.id,
       member={
         'userIdentifier': user_profile_id
@@ -181,12 +598,81 @@ def dz_delete_project_membership(domain, project, user_profile_id):
   return response
 
 
+def teardown_project_membership(domain, project, user_profile_id):
+  """
+  Delete a project membership, treating a membership that does not exist as deleted, so the
+  rollback of a partly created batch succeeds.
+  """
+  try:
+    return dz_delete_project_membership(domain, project, user_profile_id)
+  except ClientError as err:
+    if err.response["Error"]["Code"] == "ResourceNotFoundException":
+      logger.info(f"Project {project.name} membership already deleted!")
+      return None
+    raise err
+
+
+def dz_list_project_members(domain, project):
+  """
+  Return the designation of each user member of a project keyed by user profile id, following
+  every result page. Group members are skipped.
+  """
+  members = {}
+  try:
+    paginator = utils.get_client("datazone").get_paginator("list_project_memberships")
+    utils.datazone_rate_limiter.acquire()
+    for page in paginator.paginate(domainIdentifier=domain.id, projectIdentifier=project.id,
+                                   maxResults=LIST_MEMBERSHIPS_MAX_RESULTS):
+      members.update((member["memberDetails"]["user"]["userId"], member["designation"])
+                     for member in page["members"] if "user" in member["memberDetails"])
+      utils.datazone_rate_limiter.acquire()
+  except ClientError as err:
+    logger.error(f"Exception {err}")
+    raise err
+
+  return members
+
+
+def dz_search_iam_user_profiles(domain_id):
+  """
+  Return the IAM user profiles of a domain, following every result page.
+  """
+  user_profiles = []
+  try:
+    paginator = utils.get_client("datazone").get_paginator("search_user_profiles")
+    utils.datazone_rate_limiter.acquire()
+    for page in paginator.paginate(domainIdentifier=domain_id, userType="DATAZONE_IAM_USER",
+                                   maxResults=SEARCH_USER_PROFILES_MAX_RESULTS):
+      user_profiles.extend(page["items"])
+      utils.datazone_rate_limiter.acquire()
+  except ClientError as err:
+    logger.error(f"Exception {err}")
+    raise err
+
+  return user_profiles
+
+
+def dz_change_project_membership_designation(domain, project, user, user_profile_id):
+  """
+  Change the designation of an existing project membership.
+
+  DataZone has no call updating a membership in place, so the membership is deleted and
+  created again with the new designation.
+  """
+  delete_response = dz_delete_project_membership(domain, project, user_profile_id)
+  response = dz_create_project_membership(domain, project, user, user_profile_id)
+  logger.info(f"Project {project.name} membership designation changed to {user.designation}")
+
+  return response
+
+
 def dz_create_user_profile(domain_id, user_id):
   """
   Create user profile for the data solution.
   """
+  utils.datazone_rate_limiter.acquire()
   try:
-    response = dz_client.create_user_profile(
+    response = utils.get_client("datazone").create_user_profile(
       clientToken=str(uuid4()),
       domainIdentifier=domain_id,
       userIdentifier=user_id,
@@ -210,8 +696,9 @@ def dz_get_user_profile_id(domain_id, user_id):
   """
   Get user profile ID for the data solution.
   """
+  utils.datazone_rate_limiter.acquire()
   try:
-    response = dz_client.get_user_profile(
+    response = utils.get_client("datazone").get_user_profile(
       domainIdentifier=domain_id,
       type='IAM',
       userIdentifier=user_id
@@ -238,12 +725,48 @@ def lambda_handler(event, context):
   """
   request_type = event["RequestType"]
   domain_id = event["ResourceProperties"]["DomainId"]
+  domain = Domain(id=domain_id)
+
+  if "Rosters" in event["ResourceProperties"]:
+    rosters = get_project_rosters(event["ResourceProperties"])
+    roster_prune = str(event["ResourceProperties"].get("RosterPrune", "false")).lower() == "true"
+    are_valid_parameters = utils.check_input_parameters(request_type, domain_id, rosters)
+
+    if are_valid_parameters and request_type == "Create":
+      response = on_sync_rosters(domain, [], rosters, roster_prune)
+    elif are_valid_parameters and request_type == "Delete":
+      response = on_delete_rosters(domain, rosters)
+    elif are_valid_parameters and request_type == "Update":
+      old_rosters = get_project_rosters(event["OldResourceProperties"])
+      response = on_sync_rosters(domain, old_rosters, rosters, roster_prune)
+    else:
+      logger.error(f"Unsupported request type: {request_type}")
+      raise ValueError(f"Unsupported request type: {request_type}")
+
+    return response
+
+  if "Users" in event["ResourceProperties"]:
+    memberships = get_batch_memberships(event["ResourceProperties"])
+    are_valid_parameters = utils.check_input_parameters(request_type, domain_id, memberships)
+
+    if are_valid_parameters and request_type == "Create":
+      response = on_create_batch(domain, memberships)
+    elif are_valid_parameters and request_type == "Delete":
+      response = on_delete_batch(domain, memberships)
+    elif are_valid_parameters and request_type == "Update":
+      old_memberships = get_batch_memberships(event["OldResourceProperties"])
+      response = on_update_batch(domain, old_memberships, memberships)
+    else:
+      logger.error(f"Unsupported request type: {request_type}")
+      raise ValueError(f"Unsupported request type: {request_type}")
+
+    return response
+
   project_id = event["ResourceProperties"]["ProjectId"]
   project_name = event["ResourceProperties"]["ProjectName"]
   designation = event["ResourceProperties"]["Designation"]
   user_id = event["ResourceProperties"]["UserIdentifier"]
 
-  domain = Domain(id=domain_id)
   project = Project(name=project_name, id=project_id)
   user = User(id=user_id, designation=designation)
 
@@ -255,7 +778,10 @@ def lambda_handler(event, context):
   elif are_valid_parameters and request_type == "Delete":
     response = on_delete(domain, project, user)
   elif are_valid_parameters and request_type == "Update":
-    response = on_update(domain, project, user)
+    old_properties = event["OldResourceProperties"]
+    old_project = Project(name=old_properties["ProjectName"], id=old_properties["ProjectId"])
+    old_user = User(id=old_properties["UserIdentifier"], designation=old_properties["Designation"])
+    response = on_update(domain, old_project, old_user, project, user)
   else:
     logger.error(f"Unsupported request type: {request_type}")
     raise ValueError(f"Unsupported request type: {request_type}")
@@ -29,15 +29,11 @@ import json
 from common import utils
 from botocore.exceptions import ClientError
 
-# Set logger, tracer, and session
+# Set logger and tracer
 log_level = os.environ.get("LOG_LEVEL", "INFO")
 tracer_disabled = os.environ.get("TRACER_DISABLED", False)
 logger = utils.get_logger(log_level=log_level, service_name="set_domain_owner")
 tracer = utils.get_tracer(tracer_disabled=tracer_disabled, service_name="set_domain_owner")
-session = utils.get_session()
-
-# Initiate clients
-dz_client = session.client("datazone")
 
 
 def lambda_handler(event, context):
@@ -55,7 +51,7 @@ def lambda_handler(event, context):
 
         # Get domain information using assumed role
         logger.info(f"Getting domain information for: {domain_identifier}")
-        domain_response = dz_client.get_domain(
+        domain_response = utils.get_client("datazone").get_domain(
             identifier=domain_identifier
         )
         logger.info("Domain information retrieved successfully:")
@@ -65,7 +61,7 @@ def lambda_handler(event, context):
         root_domain_unit_id = domain_response['rootDomainUnitId']
 
         # Add entity owner using assumed role
-        owner_response = dz_client.add_entity_owner(
+        owner_response = utils.get_client("datazone").add_entity_owner(
             clientToken=client_token,
             domainIdentifier=domain_identifier,
             entityIdentifier=root_domain_unit_id,
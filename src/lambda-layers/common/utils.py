@@ -17,9 +17,43 @@ SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
 This code provides various utilities for Data Mesh Solution
 """
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic, sleep
 from aws_lambda_powertools import Logger
 from aws_lambda_powertools import Tracer
 from boto3.session import Session
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+# Shared botocore configuration for every client handed out by get_client()
+CLIENT_CONFIG = Config(
+  max_pool_connections=25,
+  connect_timeout=5,
+  read_timeout=30,
+  tcp_keepalive=True,
+  retries={
+    "max_attempts": 8,
+    "mode": "adaptive"
+  }
+)
+
+# Default time-to-live of cached SSM parameter values
+PARAMETER_CACHE_TTL_SECONDS = 300
+# Maximum number of names accepted by ssm:GetParameters
+GET_PARAMETERS_MAX_NAMES = 10
+# Client-side limit of DataZone calls per second of an execution environment
+DATAZONE_REQUESTS_PER_SECOND = float(os.environ.get("DATAZONE_REQUESTS_PER_SECOND", 10))
+# DataZone error codes of deletions that may succeed once the resource is disabled
+DISABLE_REQUIRED_ERROR_CODES = ("ConflictException", "ValidationException")
+
+_shared_session = None
+_clients = {}
+_clients_lock = threading.Lock()
+_parameters = {}
+_parameters_lock = threading.Lock()
 
 
 def get_logger(log_level: str = "INFO", service_name: str = "") -> Logger:
@@ -46,6 +80,263 @@ def get_region() -> str:
   return get_session().region_name
 
 
+def get_client(service_name: str, region_name: str = None):
+  """
+  Return a boto3 client for the given service and region.
+
+  Clients are created on first use with CLIENT_CONFIG and kept for the lifetime of the
+  execution environment, so warm invocations reuse their connection pools.
+  """
+  global _shared_session
+
+  key = (service_name, region_name)
+  client = _clients.get(key)
+  if client:
+    return client
+
+  # boto3 sessions are not thread safe, client creation is serialized
+  with _clients_lock:
+    client = _clients.get(key)
+    if not client:
+      if not _shared_session:
+        _shared_session = get_session()
+      client = _shared_session.client(service_name, region_name=region_name, config=CLIENT_CONFIG)
+      _clients[key] = client
+
+  return client
+
+
+def _cache_parameter(name: str, value: str, ttl: int):
+  """Store a parameter value in the cache"""
+  with _parameters_lock:
+    _parameters[name] = (value, monotonic() + ttl)
+
+
+def _get_cached_parameter(name: str):
+  """Return a cached parameter value, or None if it is missing or expired"""
+  with _parameters_lock:
+    cached = _parameters.get(name)
+    if cached and cached[1] > monotonic():
+      return cached[0]
+    _parameters.pop(name, None)
+
+  return None
+
+
+def get_parameter(name: str, ttl: int = PARAMETER_CACHE_TTL_SECONDS, force_fetch: bool = False) -> str:
+  """
+  Return the value of an SSM parameter, served from the process-wide cache while fresh.
+
+  A missing parameter raises the ClientError returned by ssm:GetParameter.
+  """
+  if not force_fetch:
+    value = _get_cached_parameter(name)
+    if value is not None:
+      return value
+
+  value = get_client("ssm").get_parameter(Name=name)["Parameter"]["Value"]
+  _cache_parameter(name, value, ttl)
+
+  return value
+
+
+def get_parameters(names, ttl: int = PARAMETER_CACHE_TTL_SECONDS, force_fetch: bool = False) -> dict:
+  """
+  Return a name to value dictionary for the given SSM parameters.
+
+  Values missing from the cache are fetched with batched ssm:GetParameters calls.
+  Parameters that do not exist are left out of the result.
+  """
+  values = {}
+  missing = []
+  for name in dict.fromkeys(names):
+    value = None if force_fetch else _get_cached_parameter(name)
+    if value is None:
+      missing.append(name)
+    else:
+      values[name] = value
+
+  ssm_client = get_client("ssm")
+  for index in range(0, len(missing), GET_PARAMETERS_MAX_NAMES):
+    response = ssm_client.get_parameters(Names=missing[index:index + GET_PARAMETERS_MAX_NAMES])
+    for parameter in response["Parameters"]:
+      _cache_parameter(parameter["Name"], parameter["Value"], ttl)
+      values[parameter["Name"]] = parameter["Value"]
+
+  return values
+
+
+def prefetch_parameters_by_path(path: str, recursive: bool = True, ttl: int = PARAMETER_CACHE_TTL_SECONDS) -> dict:
+  """
+  Load every SSM parameter under a path into the cache and return them as a name to value dictionary.
+  """
+  values = {}
+  paginator = get_client("ssm").get_paginator("get_parameters_by_path")
+  for page in paginator.paginate(Path=path, Recursive=recursive):
+    for parameter in page["Parameters"]:
+      _cache_parameter(parameter["Name"], parameter["Value"], ttl)
+      values[parameter["Name"]] = parameter["Value"]
+
+  return values
+
+
+def invalidate_parameters(*names):
+  """Drop the given parameters from the cache, or every cached parameter if no name is given"""
+  with _parameters_lock:
+    if not names:
+      _parameters.clear()
+    for name in names:
+      _parameters.pop(name, None)
+
+
+class LruCache:
+  """
+  Thread safe least recently used cache with a time-to-live per entry.
+
+  Instances are meant to live at module level so they survive warm invocations.
+  The max_size cap protects the Lambda memory, the oldest entries are evicted first.
+  """
+
+  def __init__(self, max_size: int = 1024, ttl: int = 900):
+    self.max_size = max_size
+    self.ttl = ttl
+    self.hits = 0
+    self.misses = 0
+    self._entries = OrderedDict()
+    self._lock = threading.Lock()
+
+  def get(self, key):
+    """Return the cached value for the key, or None if it is missing or expired"""
+    with self._lock:
+      entry = self._entries.get(key)
+      if entry and entry[1] > monotonic():
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+      self._entries.pop(key, None)
+      self.misses += 1
+
+    return None
+
+  def put(self, key, value):
+    """Store a value, evicting the least recently used entries above max_size"""
+    with self._lock:
+      self._entries[key] = (value, monotonic() + self.ttl)
+      self._entries.move_to_end(key)
+      while len(self._entries) > self.max_size:
+        self._entries.popitem(last=False)
+
+  def invalidate(self, *keys):
+    """Drop the given keys, or every entry if no key is given"""
+    with self._lock:
+      if not keys:
+        self._entries.clear()
+      for key in keys:
+        self._entries.pop(key, None)
+
+  def stats(self) -> dict:
+    """Return the hit and miss counters and the current size"""
+    with self._lock:
+      return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+  def reset_stats(self):
+    """Reset the hit and miss counters, typically at the start of an invocation"""
+    with self._lock:
+      self.hits = 0
+      self.misses = 0
+
+
+class RateLimiter:
+  """
+  Thread safe token bucket shared by the workers calling a rate limited API.
+
+  acquire() blocks until a call is allowed, so that on average no more than rate calls per
+  second are made, with bursts of up to burst calls.
+  """
+
+  def __init__(self, rate: float, burst: int = None):
+    self.rate = rate
+    self.burst = burst or max(1, int(rate))
+    self._tokens = float(self.burst)
+    self._updated = monotonic()
+    self._lock = threading.Lock()
+
+  def acquire(self):
+    """Wait until the next call is allowed"""
+    with self._lock:
+      now = monotonic()
+      self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+      self._updated = now
+      # A negative balance reserves a future slot for this caller
+      self._tokens -= 1
+      wait = -self._tokens / self.rate if self._tokens < 0 else 0
+
+    if wait > 0:
+      sleep(wait)
+
+
+# Shared by every DataZone call of the execution environment, across modules and worker threads
+datazone_rate_limiter = RateLimiter(rate=DATAZONE_REQUESTS_PER_SECOND)
+
+
+def run_concurrently(function, argument_lists, max_workers: int = 10, return_exceptions: bool = False) -> list:
+  """
+  Call function with each tuple of argument_lists on a bounded thread pool.
+
+  Results are returned in the order of argument_lists. The first exception raised by a call
+  is re-raised once all calls are done, unless return_exceptions is set, in which case
+  exceptions are returned in place of the results of the calls that raised them.
+  """
+  argument_lists = list(argument_lists)
+  if not argument_lists:
+    return []
+
+  with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(argument_lists)))) as executor:
+    futures = [executor.submit(function, *arguments) for arguments in argument_lists]
+
+  if return_exceptions:
+    return [future.exception() or future.result() for future in futures]
+
+  return [future.result() for future in futures]
+
+
+def delete_with_disable_fallback(delete, disable):
+  """
+  Call delete, and only when DataZone refuses the deletion with one of DISABLE_REQUIRED_ERROR_CODES,
+  call disable and delete again. A resource that does not exist counts as deleted.
+
+  Returns the response of the deletion, None when the resource was already deleted.
+  """
+  try:
+    return delete()
+  except ClientError as err:
+    error_code = err.response["Error"]["Code"]
+    if error_code == "ResourceNotFoundException":
+      return None
+    if error_code not in DISABLE_REQUIRED_ERROR_CODES:
+      raise err
+
+  disable()
+
+  return delete()
+
+
+def stack_exists(stack_name: str) -> bool:
+  """
+  Return whether a CloudFormation stack exists, with a single DescribeStacks call.
+
+  Deleted stacks are only described by stack id, they count as missing.
+  """
+  try:
+    stacks = get_client("cloudformation").describe_stacks(StackName=stack_name)["Stacks"]
+  except ClientError as err:
+    if err.response["Error"]["Code"] == "ValidationError" and "does not exist" in err.response["Error"]["Message"]:
+      return False
+    raise err
+
+  return any(stack["StackStatus"] != "DELETE_COMPLETE" for stack in stacks)
+
+
 def check_input_parameters(*parameters):
   """Check if all parameters are not empty"""
   logger = get_logger(log_level="INFO", service_name="utils_check_input_parameters")
@@ -0,0 +1,33 @@
+"""
+Shared pytest setup: the Lambda layer and function directories are put on the import path the
+way the Lambda runtime does, and AWS clients are replaced by in-memory fakes.
+"""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR / "lambda-layers"))
+for function_dir in sorted((SRC_DIR / "lambda-functions").iterdir()):
+  sys.path.insert(0, str(function_dir))
+
+os.environ.setdefault("AWS_REGION", "us-east-1")
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+os.environ.setdefault("POWERTOOLS_TRACE_DISABLED", "true")
+os.environ.setdefault("DATAZONE_REQUESTS_PER_SECOND", "100000")
+
+from common import utils  # noqa: E402
+
+
+@pytest.fixture
+def clients(monkeypatch):
+  """
+  Return a dict of fake clients keyed by service name, handed out by utils.get_client()
+  """
+  fake_clients = {}
+  monkeypatch.setattr(utils, "get_client", lambda service_name, region_name=None: fake_clients[service_name])
+
+  return fake_clients
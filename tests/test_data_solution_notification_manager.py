@@ -0,0 +1,34 @@
+import os
+import json
+
+os.environ.setdefault("PARAMETER_STORE_NAME_PREFIX", "test/dev/domain")
+os.environ.setdefault("DOMAIN_ID_PARAMETER_NAME", "/test/dev/domain/domain-id")
+
+import data_solution_notification_manager as manager  # noqa: E402
+
+
+def subscription_request_record(message_id, project_name):
+  body = {"dataProductName": "Sales", "dataOwnerProjectName": project_name,
+          "accessRequestorProjectName": "Analytics", "userName": "analyst"}
+  return {
+    "messageId": message_id,
+    "body": json.dumps(body),
+    "messageAttributes": {
+      "messageType": {"stringValue": "SubscriptionRequest"},
+      "dataOwnerProjectName": {"stringValue": project_name},
+    }
+  }
+
+
+def test_unclassifiable_record_fails_alone(monkeypatch):
+  digests = []
+  monkeypatch.setattr(manager, "send_subscription_request_digest",
+                      lambda project_name, requests: digests.append((project_name, len(requests))))
+  event = {"Records": [subscription_request_record("good", "Sales"), {"messageId": "bad", "body": "{}"},
+                       {"messageId": "no-project", "messageAttributes": {
+                         "messageType": {"stringValue": "SubscriptionRequest"}}}]}
+
+  response = manager.process_sqs_message(event)
+
+  assert response == {"batchItemFailures": [{"itemIdentifier": "bad"}, {"itemIdentifier": "no-project"}]}
+  assert digests == [("Sales", 1)]
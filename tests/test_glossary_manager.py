@@ -0,0 +1,184 @@
+import itertools
+
+import pytest
+from botocore.exceptions import ClientError, ReadTimeoutError
+
+import glossary_manager
+
+
+class FakeDataZone:
+  """
+  Creates glossaries and terms, raising failure for the term named failing_term
+  """
+
+  def __init__(self, failing_term=None, failure=None):
+    self.ids = itertools.count(1)
+    self.failing_term = failing_term
+    self.failure = failure
+    self.created_terms = []
+
+  def create_glossary(self, name, **kwargs):
+    return {"id": f"g{next(self.ids)}", "name": name}
+
+  def create_glossary_term(self, name, **kwargs):
+    if name == self.failing_term:
+      raise self.failure
+    self.created_terms.append(name)
+    return {"id": f"t{next(self.ids)}", "name": name}
+
+
+@pytest.fixture
+def glossary(tmp_path, monkeypatch):
+  monkeypatch.setattr(glossary_manager, "mapping_store", glossary_manager.LocalMappingStore(str(tmp_path / "map.json")))
+  terms = [{"Name": f"term{i}", "ShortDescription": "s", "LongDescription": "l"} for i in range(250)]
+
+  return glossary_manager.Glossary(
+    projectGlossaries=[{"GlossaryName": "Glossary", "GlossaryDescription": "d", "GlossaryTerms": terms}],
+    glossaryParamStoreName="/test/glossary", glossaryTermParamStoreNamePrefix="/test/glossary-terms")
+
+
+def test_create_checkpoints_term_ids_on_non_client_error(clients, glossary):
+  clients["datazone"] = FakeDataZone(failing_term="term120", failure=ReadTimeoutError(endpoint_url="https://datazone"))
+
+  with pytest.raises(ReadTimeoutError):
+    glossary_manager.create_project_glossary("dzd", "project", glossary)
+
+  created_terms = clients["datazone"].created_terms
+  term_ids = glossary_manager.load_glossary_index(glossary).termIds
+  assert len(created_terms) == 249
+  assert sorted(name for ids in term_ids.values() for name in ids) == sorted(created_terms)
+
+  clients["datazone"] = FakeDataZone()
+  glossary_manager.create_project_glossary("dzd", "project", glossary)
+  assert clients["datazone"].created_terms == ["term120"]
+
+
+def mapped_ids(glossary_index):
+  """
+  Return the glossary and term ids of an index, glossaries without terms have no term mapping
+  """
+  return glossary_index.glossaryIds, {glossary_id: term_ids for glossary_id, term_ids in glossary_index.termIds.items()
+                                      if term_ids}
+
+
+def test_mapping_round_trip_through_journal_and_compaction(glossary, monkeypatch):
+  monkeypatch.setattr(glossary_manager, "GLOSSARY_MAPPING_SHARD_SIZE", 200)
+  glossary_index = glossary_manager.load_glossary_index(glossary)
+  glossary_index.glossaryIds = {"Glossary": "g1", "Empty": "g2"}
+  glossary_index.termIds = {"g1": {f"term{i}": f"t{i}" for i in range(300)}, "g2": {}}
+  glossary_manager.save_glossary_index(glossary, glossary_index)
+
+  loaded_index = glossary_manager.load_glossary_index(glossary)
+  assert mapped_ids(loaded_index) == mapped_ids(glossary_index)
+  assert loaded_index.header["shards"] > 1
+  assert loaded_index.header["journal"] == []
+
+  revisions = {loaded_index.header["revision"]}
+  for i in range(40):
+    loaded_index.termIds["g1"][f"new{i}"] = f"n{i}"
+    loaded_index.termIds["g1"].pop(f"term{i * 3}")
+    glossary_manager.save_glossary_index(glossary, loaded_index)
+
+    reloaded_index = glossary_manager.load_glossary_index(glossary)
+    assert mapped_ids(reloaded_index) == mapped_ids(loaded_index)
+    revisions.add(reloaded_index.header["revision"])
+    loaded_index = reloaded_index
+
+  header = loaded_index.header
+  assert len(revisions) > 1
+  assert len(header["journal"]) < glossary_manager.GLOSSARY_MAPPING_MAX_JOURNAL_SEGMENTS
+  stored_names = glossary_manager.mapping_store.get_by_path(glossary.glossaryTermParamStoreNamePrefix)
+  assert all(f"/r{header['revision']}/" in name for name in stored_names)
+
+
+def test_legacy_string_list_mapping_is_migrated_on_save(glossary):
+  glossary_manager.mapping_store.put({
+    "/test/glossary": "Glossary:g1,Other:g2",
+    "/test/glossary-terms/g1": "a:t1,b:t2",
+    "/test/glossary-terms/g2": "c:t3",
+  })
+
+  glossary_index = glossary_manager.load_glossary_index(glossary)
+  assert glossary_index.glossaryIds == {"Glossary": "g1", "Other": "g2"}
+  assert glossary_index.termIds == {"g1": {"a": "t1", "b": "t2"}, "g2": {"c": "t3"}}
+
+  glossary_manager.save_glossary_index(glossary, glossary_index)
+
+  assert glossary_manager.mapping_store.get("/test/glossary").startswith("{")
+  stored_names = glossary_manager.mapping_store.get_by_path("/test/glossary-terms")
+  assert "/test/glossary-terms/g1" not in stored_names
+  assert "/test/glossary-terms/g2" not in stored_names
+  migrated_index = glossary_manager.load_glossary_index(glossary)
+  assert mapped_ids(migrated_index) == mapped_ids(glossary_index)
+
+
+class FakeSearchPaginator:
+  """
+  Returns every glossary or term of the fake in a single search page
+  """
+
+  def __init__(self, datazone):
+    self.datazone = datazone
+
+  def paginate(self, searchScope, **kwargs):
+    if searchScope == "GLOSSARY":
+      yield {"items": [{"glossaryItem": dict(item)} for item in self.datazone.glossaries.values()]}
+    else:
+      yield {"items": [{"glossaryTermItem": dict(item)} for item in self.datazone.terms.values()]}
+
+
+class FakeLiveDataZone:
+  """
+  Keeps the glossaries and terms of one project by id, searchable like DataZone
+  """
+
+  def __init__(self):
+    self.ids = itertools.count(1)
+    self.glossaries = {}
+    self.terms = {}
+
+  def get_paginator(self, operation_name):
+    return FakeSearchPaginator(self)
+
+  def create_glossary(self, name, description=None, status="ENABLED", **kwargs):
+    glossary_id = f"g{next(self.ids)}"
+    self.glossaries[glossary_id] = {"id": glossary_id, "name": name, "description": description, "status": status}
+    return {"id": glossary_id, "name": name}
+
+  def create_glossary_term(self, glossaryIdentifier, name, shortDescription=None, longDescription=None,
+                           status="ENABLED", **kwargs):
+    term_id = f"t{next(self.ids)}"
+    self.terms[term_id] = {"id": term_id, "name": name, "glossaryId": glossaryIdentifier, "status": status,
+                           "shortDescription": shortDescription, "longDescription": longDescription}
+    return {"id": term_id, "name": name}
+
+  def update_glossary(self, identifier, **kwargs):
+    self.glossaries[identifier].update({key: value for key, value in kwargs.items() if key in ("description", "status")})
+    return dict(self.glossaries[identifier])
+
+  def update_glossary_term(self, identifier, **kwargs):
+    return dict(self.terms[identifier])
+
+  def delete_glossary(self, identifier, **kwargs):
+    if identifier not in self.glossaries:
+      raise ClientError({"Error": {"Code": "ResourceNotFoundException", "Message": "missing"}}, "DeleteGlossary")
+    del self.glossaries[identifier]
+
+  def delete_glossary_term(self, identifier, **kwargs):
+    if identifier not in self.terms:
+      raise ClientError({"Error": {"Code": "ResourceNotFoundException", "Message": "missing"}}, "DeleteGlossaryTerm")
+    del self.terms[identifier]
+
+
+def test_reconcile_leaves_glossaries_outside_the_config_to_teardown(clients, glossary):
+  clients["datazone"] = datazone = FakeLiveDataZone()
+  manual_glossary_id = datazone.create_glossary("Manual", "made by hand")["id"]
+  datazone.create_glossary_term(manual_glossary_id, "manual-term")
+  glossary.projectGlossaries[0]["GlossaryTerms"] = glossary.projectGlossaries[0]["GlossaryTerms"][:2]
+
+  glossary_manager.reconcile_project_glossary("dzd", "project", glossary, [], "ENABLED")
+  assert glossary_manager.load_glossary_index(glossary).glossaryIds.keys() == {"Glossary"}
+
+  glossary_manager.delete_project_glossary("dzd", glossary)
+  assert [item["name"] for item in datazone.glossaries.values()] == ["Manual"]
+  assert [item["name"] for item in datazone.terms.values()] == ["manual-term"]
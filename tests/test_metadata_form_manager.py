@@ -0,0 +1,71 @@
+import pytest
+
+import metadata_form_manager as manager
+
+VALID_MODEL = """
+$version: "2"
+namespace amazon.datazone
+
+@documentation(\"\"\"Ownership of the asset\"\"\")
+structure Ownership {
+  @required
+  @amazon.datazone#searchable
+  owner: String
+
+  @enum([{value: "GOLD"}, {value: "SILVER"}])
+  tier: String
+
+  @default(0)
+  retentionDays: Integer
+
+  @timestampFormat("date-time")
+  reviewedAt: Timestamp
+
+  stewards: Stewards
+  level: Level = "LOW"
+}
+
+list Stewards {
+  member: String
+}
+
+enum Level {
+  LOW
+  HIGH = "high"
+}
+"""
+
+
+@pytest.fixture
+def warnings(monkeypatch):
+  messages = []
+  monkeypatch.setattr(manager.logger, "warning", messages.append)
+
+  return messages
+
+
+def test_parser_accepts_shapes_and_traits_it_does_not_check(warnings):
+  structures = manager.SmithyModelParser(VALID_MODEL).parse()
+
+  assert set(structures["Ownership"]["members"]) == {"owner", "tier", "retentionDays", "reviewedAt", "stewards",
+                                                     "level"}
+  assert structures["Ownership"]["members"]["stewards"]["target"] == "Stewards"
+  assert any("@enum" in message for message in warnings)
+  assert any("@timestampFormat" in message for message in warnings)
+  manager.validate_project_metadata_forms([{"FormName": "Ownership", "FormSmithyModel": VALID_MODEL}])
+
+
+@pytest.mark.parametrize("model, error", [
+  ("structure Ownership {\n  owner: String\n", "expected"),
+  ("list Stewards {\n  member: String\n}\n", "at least one structure"),
+  ("structure Ownership {\n  owner String\n}\n", "expected : after member owner"),
+  ("structure Ownership {\n  owner: String\n}\n}\n", "line 4"),
+])
+def test_parser_rejects_malformed_syntax(warnings, model, error):
+  with pytest.raises(ValueError, match=error):
+    manager.SmithyModelParser(model).parse()
+
+
+def test_validation_reports_a_missing_form_structure(warnings):
+  with pytest.raises(ValueError, match="must define a structure named Quality"):
+    manager.validate_project_metadata_forms([{"FormName": "Quality", "FormSmithyModel": VALID_MODEL}])
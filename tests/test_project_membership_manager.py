@@ -0,0 +1,122 @@
+import json
+
+import pytest
+from botocore.exceptions import ClientError
+
+import project_membership_manager as manager
+
+
+def client_error(code):
+  return ClientError({"Error": {"Code": code, "Message": code}}, "Operation")
+
+
+class FakeDataZone:
+  """
+  Keeps project members as {project id: {user profile id: designation}}
+  """
+
+  def __init__(self, members=None, profiles=None):
+    self.members = members or {}
+    self.profiles = profiles or {}
+
+  def get_user_profile(self, userIdentifier, **kwargs):
+    if userIdentifier not in self.profiles:
+      raise client_error("ResourceNotFoundException")
+    return {"id": self.profiles[userIdentifier]}
+
+  def delete_project_membership(self, projectIdentifier, member, **kwargs):
+    if member["userIdentifier"] not in self.members.get(projectIdentifier, {}):
+      raise client_error("ResourceNotFoundException")
+    del self.members[projectIdentifier][member["userIdentifier"]]
+
+
+@pytest.fixture(autouse=True)
+def clear_user_profile_cache():
+  manager.user_profile_cache.invalidate()
+
+
+def test_batch_delete_treats_missing_memberships_as_deleted(clients):
+  clients["datazone"] = FakeDataZone(members={"p1": {"up-u1": "PROJECT_OWNER"}}, profiles={"u1": "up-u1", "u2": "up-u2"})
+  event = {
+    "RequestType": "Delete",
+    "ResourceProperties": {
+      "DomainId": "dzd",
+      "Projects": [{"ProjectId": "p1", "ProjectName": "P1"}, {"ProjectId": "p2", "ProjectName": "P2"}],
+      "Users": [{"UserIdentifier": "u1", "Designation": "PROJECT_OWNER"},
+                {"UserIdentifier": "u2", "Designation": "PROJECT_OWNER"},
+                {"UserIdentifier": "u3", "Designation": "PROJECT_OWNER"}]
+    }
+  }
+
+  report = json.loads(manager.lambda_handler.__wrapped__(event, None)["body"])
+
+  assert report["failed"] == 0
+  assert report["succeeded"] == 6
+  assert clients["datazone"].members == {"p1": {}}
+
+
+def roster_memberships(project, users):
+  return [manager.Membership(project=project, user=manager.User(id=user_id, designation=designation))
+          for user_id, designation in users.items()]
+
+
+@pytest.mark.parametrize("prune, expected_deletes", [
+  (False, {"up-old": "old"}),
+  (True, {"up-old": "old", "up-manual": "up-manual"}),
+])
+def test_roster_sync_plans_add_change_and_remove(prune, expected_deletes):
+  project = manager.Project(name="P1", id="p1")
+  live_members = {"p1": {"up-keep": "PROJECT_OWNER", "up-change": "PROJECT_CONTRIBUTOR",
+                         "up-old": "PROJECT_CONTRIBUTOR", "up-manual": "PROJECT_CONTRIBUTOR"}}
+  memberships = roster_memberships(project, {"keep": "PROJECT_OWNER", "change": "PROJECT_OWNER",
+                                             "add": "PROJECT_CONTRIBUTOR"})
+  user_profile_ids = {"keep": "up-keep", "change": "up-change", "add": "up-add"}
+  old_user_ids = {("p1", "keep"), ("p1", "change"), ("p1", "old")}
+  old_user_profile_ids = {**user_profile_ids, "old": "up-old"}
+
+  operations, operation_user_profile_ids = manager.plan_roster_sync(
+    [project], live_members, memberships, user_profile_ids, old_user_ids, old_user_profile_ids, prune)
+
+  planned = {(operation, user_profile_id) for (operation, _), user_profile_id in
+             zip(operations, operation_user_profile_ids)}
+  assert planned == {("create", "up-add"), ("change", "up-change")} | {("delete", user_profile_id)
+                                                                       for user_profile_id in expected_deletes}
+  # Members of the old roster are reported by user identifier, unlisted members by profile id
+  assert {user_profile_id: membership.user.id for (operation, membership), user_profile_id
+          in zip(operations, operation_user_profile_ids) if operation == "delete"} == expected_deletes
+
+
+def test_roster_sync_plans_nothing_without_drift():
+  project = manager.Project(name="P1", id="p1")
+  memberships = roster_memberships(project, {"keep": "PROJECT_OWNER"})
+
+  operations, _ = manager.plan_roster_sync([project], {"p1": {"up-keep": "PROJECT_OWNER"}}, memberships,
+                                           {"keep": "up-keep"}, {("p1", "keep")}, {"keep": "up-keep"}, prune=True)
+
+  assert operations == []
+
+
+def test_roster_sync_creates_members_whose_profile_failed():
+  project = manager.Project(name="P1", id="p1")
+  failure = client_error("AccessDeniedException")
+
+  operations, operation_user_profile_ids = manager.plan_roster_sync(
+    [project], {"p1": {}}, roster_memberships(project, {"denied": "PROJECT_OWNER"}), {"denied": failure}, set(), {},
+    prune=False)
+
+  assert [operation for operation, _ in operations] == ["create"]
+  assert operation_user_profile_ids == [failure]
+
+
+@pytest.mark.parametrize("prune", [False, True])
+def test_roster_sync_removes_nothing_from_a_project_with_unresolved_users(prune):
+  project = manager.Project(name="P1", id="p1")
+  failure = client_error("ThrottlingException")
+  memberships = roster_memberships(project, {"keep": "PROJECT_OWNER"})
+
+  operations, operation_user_profile_ids = manager.plan_roster_sync(
+    [project], {"p1": {"up-keep": "PROJECT_OWNER", "up-old": "PROJECT_OWNER"}}, memberships, {"keep": failure},
+    {("p1", "keep"), ("p1", "old")}, {"keep": failure, "old": "up-old"}, prune)
+
+  assert [(operation, membership.user.id) for operation, membership in operations] == [("create", "keep")]
+  assert operation_user_profile_ids == [failure]